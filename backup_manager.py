@@ -10,6 +10,7 @@ import os
 import json
 import time
 import threading
+import tempfile
 import concurrent.futures
 from datetime import datetime
 from pathlib import Path
@@ -76,60 +77,63 @@ class BackupManager:
         # System resource check before starting
         self._check_system_resources()
         
-        # Discover services
-        services = self.service_discovery.discover_services()
-        
-        # Filter services if service_names provided
-        if service_names:
-            services = [s for s in services if s.service_name in service_names]
-            logger.info(f"Filtered to {len(services)} specified services")
-        
-        if not services:
-            logger.warning("No services found to back up")
-            return {}
-        
-        logger.info(f"Found {len(services)} services to back up")
-        
-        # Filter out backup service itself
-        backup_service_names = os.environ.get('BACKUP_SERVICE_NAMES', 'container-backup,backup').split(',')
-        backup_service_names = [name.strip() for name in backup_service_names]
-        services = [s for s in services if s.service_name not in backup_service_names]
-        
-        # Sort services by priority
-        services.sort(key=lambda s: s.config.get('global', {}).get('priority', 50))
-        
-        # Update retention configuration from service configs
-        self._update_retention_config(services)
-        
-        # Determine optimal number of workers based on system resources
-        max_workers = self._get_optimal_worker_count()
-        
-        # Run backups in parallel with limited concurrency
-        results = {}
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit backup tasks
-            future_to_service = {
-                executor.submit(self._run_backup_with_lock, service): service
-                for service in services
-            }
+        # Scratch space shared by every service in this run
+        temp_parent = os.environ.get('BACKUP_TEMP_DIR') or None
+        with tempfile.TemporaryDirectory(prefix='backup_run_', dir=temp_parent) as temp_root:
+            # Discover services
+            services = self.service_discovery.discover_services(temp_root=temp_root)
             
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_service):
-                service = future_to_service[future]
-                try:
-                    # Check for resource pressure before processing result
-                    self._throttle_if_needed()
-                    
-                    success = future.result()
-                    results[service.service_name] = success
-                    if success:
-                        logger.info(f"Backup completed successfully for {service.service_name}")
-                    else:
-                        logger.error(f"Backup failed for {service.service_name}")
-                except Exception as e:
-                    logger.error(f"Exception during backup of {service.service_name}: {str(e)}")
-                    results[service.service_name] = False
+            # Filter services if service_names provided
+            if service_names:
+                services = [s for s in services if s.service_name in service_names]
+                logger.info(f"Filtered to {len(services)} specified services")
+            
+            if not services:
+                logger.warning("No services found to back up")
+                return {}
+            
+            logger.info(f"Found {len(services)} services to back up")
+            
+            # Filter out backup service itself
+            backup_service_names = os.environ.get('BACKUP_SERVICE_NAMES', 'container-backup,backup').split(',')
+            backup_service_names = [name.strip() for name in backup_service_names]
+            services = [s for s in services if s.service_name not in backup_service_names]
+            
+            # Sort services by priority
+            services.sort(key=lambda s: s.config.get('global', {}).get('priority', 50))
+            
+            # Update retention configuration from service configs
+            self._update_retention_config(services)
+            
+            # Determine optimal number of workers based on system resources
+            max_workers = self._get_optimal_worker_count()
+            
+            # Run backups in parallel with limited concurrency
+            results = {}
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit backup tasks
+                future_to_service = {
+                    executor.submit(self._run_backup_with_lock, service): service
+                    for service in services
+                }
+                
+                # Process results as they complete
+                for future in concurrent.futures.as_completed(future_to_service):
+                    service = future_to_service[future]
+                    try:
+                        # Check for resource pressure before processing result
+                        self._throttle_if_needed()
+                        
+                        success = future.result()
+                        results[service.service_name] = success
+                        if success:
+                            logger.info(f"Backup completed successfully for {service.service_name}")
+                        else:
+                            logger.error(f"Backup failed for {service.service_name}")
+                    except Exception as e:
+                        logger.error(f"Exception during backup of {service.service_name}: {str(e)}")
+                        results[service.service_name] = False
         
         # Apply retention policies
         deleted_count = self.apply_retention_policy()
@@ -376,7 +380,8 @@ class BackupManager:
         }
         
         # Get all backup files
-        backup_files = list(self.backup_dir.glob("*.tar.gz"))
+        backup_files = [*self.backup_dir.glob("*.tar.gz"), *self.backup_dir.glob("*.tar.zst"),
+                        *self.backup_dir.glob("*.tar")]
         status['storage']['backup_count'] = len(backup_files)
         
         # Group backups by service
@@ -12,7 +12,7 @@ import time
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import BinaryIO, Dict, List, Any, Optional, Union, Tuple
 
 from logger import get_logger
 from utils.docker_utils import exec_in_container
@@ -20,6 +20,9 @@ from utils.credential_utils import extract_database_credentials, mask_sensitive_
 
 logger = get_logger(__name__)
 
+# In-memory dumps stay in RAM up to this compressed size, then spill to disk
+DUMP_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
 
 class DatabaseBackup:
     """Handles database-specific backup operations."""
@@ -40,8 +43,121 @@ class DatabaseBackup:
         self.db_type = db_type or self._detect_db_type()
         self.config = config or {}
         
+        # When set, dumps are kept compressed in a spooled file (dump_file)
+        # that goes straight into the service archive instead of output_path
+        self.in_memory = False
+        self.dump_file: Optional[BinaryIO] = None
+        
         logger.debug(f"Initialized database backup for {container.name}, type: {self.db_type}")
 
+    def _write_dump(self, output_path: str, data: bytes) -> None:
+        """
+        Compress a dump and store it.
+        
+        In memory mode the compressed dump is kept in dump_file so it can go
+        straight into the service archive; otherwise it is written to
+        output_path through a temporary file.
+        
+        Args:
+            output_path (str): Path to store backup.
+            data (bytes): Uncompressed dump.
+            
+        Raises:
+            OSError: If the dump cannot be written.
+        """
+        if self.in_memory:
+            spool = self._open_spool(output_path)
+            with gzip.GzipFile(fileobj=spool, mode='wb') as f:
+                f.write(data)
+            self.dump_file = spool
+            return
+        
+        temp_output_path = f"{output_path}.tmp"
+        try:
+            with gzip.open(temp_output_path, 'wb') as f:
+                f.write(data)
+            
+            # Atomically move to final location
+            shutil.move(temp_output_path, output_path)
+        except Exception:
+            # Clean up temporary file if it exists
+            if os.path.exists(temp_output_path):
+                try:
+                    os.remove(temp_output_path)
+                except Exception:
+                    pass
+            raise
+
+    def _run_dump(self, output_path: str, command: str,
+                  env: Optional[Dict[str, str]] = None) -> Tuple[int, str]:
+        """
+        Run a dump command in the container and store its output compressed.
+        
+        The output is streamed straight into the compressed file, or in
+        memory mode into a spooled dump_file, so it is never held in memory
+        as a whole.
+        
+        Args:
+            output_path (str): Path to store backup.
+            command (str): Dump command writing the dump to stdout.
+            env (dict, optional): Environment variables for the command.
+            
+        Returns:
+            tuple: (exit_code, output); output is only the tail of the dump
+            when it was streamed.
+            
+        Raises:
+            OSError: If the dump cannot be written.
+        """
+        if self.in_memory:
+            spool = self._open_spool(output_path)
+            try:
+                with gzip.GzipFile(fileobj=spool, mode='wb') as f:
+                    exit_code, output = exec_in_container(self.container, command, env,
+                                                          output_writer=f)
+            except Exception:
+                spool.close()
+                raise
+            
+            if exit_code == 0:
+                self.dump_file = spool
+            else:
+                spool.close()
+            return exit_code, output
+        
+        temp_output_path = f"{output_path}.tmp"
+        try:
+            with gzip.open(temp_output_path, 'wb') as f:
+                exit_code, output = exec_in_container(self.container, command, env, output_writer=f)
+            
+            if exit_code == 0:
+                # Atomically move to final location
+                shutil.move(temp_output_path, output_path)
+                return exit_code, output
+        except Exception:
+            if os.path.exists(temp_output_path):
+                os.remove(temp_output_path)
+            raise
+        
+        os.remove(temp_output_path)
+        return exit_code, output
+
+    def _open_spool(self, output_path: str) -> BinaryIO:
+        """
+        Open a spooled file for an in-memory dump.
+        
+        Past DUMP_SPOOL_MAX_SIZE the dump spills to an unnamed file next to
+        output_path, so it stays within the backup's working directory.
+        
+        Args:
+            output_path (str): Path the dump would be written to on disk.
+            
+        Returns:
+            BinaryIO: Spooled temporary file.
+        """
+        return tempfile.SpooledTemporaryFile(max_size=DUMP_SPOOL_MAX_SIZE,
+                                             dir=os.path.dirname(output_path) or None)
+
     def _validate_path(self, path: str) -> bool:
         """
         Validate a path to ensure it's safe to use in commands.
@@ -274,34 +390,20 @@ class DatabaseBackup:
             if self.credentials.get('password'):
                 env["PGPASSWORD"] = self.credentials['password']
             
-            # Execute backup command
+            # Execute backup command, compressing and saving its output
             logger.debug(f"Executing PostgreSQL backup command: {cmd_str}")
-            exit_code, output = exec_in_container(self.container, cmd_str, env)
+            try:
+                exit_code, output = self._run_dump(output_path, cmd_str, env)
+            except Exception as e:
+                logger.error(f"Error saving PostgreSQL backup: {str(e)}")
+                return False
             
             if exit_code != 0:
                 logger.error(f"PostgreSQL backup failed: {output}")
                 return False
             
-            # Compress and save output
-            try:
-                # Create temporary file first
-                temp_output_path = f"{output_path}.temp"
-                with gzip.open(temp_output_path, 'wb') as f:
-                    f.write(output.encode('utf-8'))
-                
-                # Move to final location
-                shutil.move(temp_output_path, output_path)
-                logger.info(f"PostgreSQL backup completed successfully: {output_path}")
-                return True
-            except Exception as e:
-                logger.error(f"Error saving PostgreSQL backup: {str(e)}")
-                # Clean up temporary file if it exists
-                if os.path.exists(f"{output_path}.temp"):
-                    try:
-                        os.remove(f"{output_path}.temp")
-                    except Exception:
-                        pass
-                return False
+            logger.info(f"PostgreSQL backup completed successfully: {output_path}")
+            return True
     
     def _backup_mysql(self, output_path: str) -> bool:
             """
@@ -373,34 +475,20 @@ class DatabaseBackup:
             else:
                 env = {}
             
-            # Execute backup command
+            # Execute backup command, compressing and saving its output
             logger.debug(f"Executing MySQL backup command (without password)")
-            exit_code, output = exec_in_container(self.container, cmd, env)
+            try:
+                exit_code, output = self._run_dump(output_path, cmd, env)
+            except Exception as e:
+                logger.error(f"Error saving MySQL backup: {str(e)}")
+                return False
             
             if exit_code != 0:
                 logger.error(f"MySQL backup failed: {output}")
                 return False
             
-            # Compress and save output
-            try:
-                # Create temporary file first
-                temp_output_path = f"{output_path}.temp"
-                with gzip.open(temp_output_path, 'wb') as f:
-                    f.write(output.encode('utf-8'))
-                
-                # Move to final location
-                shutil.move(temp_output_path, output_path)
-                logger.info(f"MySQL backup completed successfully: {output_path}")
-                return True
-            except Exception as e:
-                logger.error(f"Error saving MySQL backup: {str(e)}")
-                # Clean up temporary file if it exists
-                if os.path.exists(f"{output_path}.temp"):
-                    try:
-                        os.remove(f"{output_path}.temp")
-                    except Exception:
-                        pass
-                return False
+            logger.info(f"MySQL backup completed successfully: {output_path}")
+            return True
 
     def _backup_sqlite(self, output_path: str) -> bool:
         """
@@ -494,8 +582,7 @@ class DatabaseBackup:
                     return False
                 
                 # Compress the database content
-                with gzip.open(output_path, 'wb') as f:
-                    f.write(db_content.encode('utf-8', errors='replace'))
+                self._write_dump(output_path, db_content.encode('utf-8', errors='replace'))
                 
                 # Cleanup
                 exec_in_container(self.container, "rm -f /tmp/backup.db")
@@ -530,8 +617,7 @@ class DatabaseBackup:
                 return False
             
             # Compress the database content
-            with gzip.open(output_path, 'wb') as f:
-                f.write(db_content.encode('utf-8', errors='replace'))
+            self._write_dump(output_path, db_content.encode('utf-8', errors='replace'))
             
             logger.info(f"SQLite file-based backup completed successfully: {output_path}")
             return True
@@ -639,25 +725,13 @@ class DatabaseBackup:
                 logger.error(f"Failed to retrieve MongoDB backup data")
                 return False
             
-            # Write to temporary output file first
-            temp_output_path = f"{output_path}.tmp"
-            with gzip.open(temp_output_path, 'wb') as f:
-                f.write(tar_data.encode('utf-8', errors='replace'))
-            
-            # Atomically move to final location
-            shutil.move(temp_output_path, output_path)
+            self._write_dump(output_path, tar_data.encode('utf-8', errors='replace'))
             
             logger.info(f"MongoDB backup completed successfully: {output_path}")
             return True
             
         except Exception as e:
             logger.error(f"Error during MongoDB backup: {str(e)}")
-            # Attempt to cleanup temporary output file
-            if 'temp_output_path' in locals() and os.path.exists(temp_output_path):
-                try:
-                    os.remove(temp_output_path)
-                except Exception:
-                    pass
             return False
             
         finally:
@@ -791,25 +865,13 @@ class DatabaseBackup:
                 logger.error("Failed to retrieve Redis backup data")
                 return False
             
-            # Write to temporary output file first
-            temp_output_path = f"{output_path}.tmp"
-            with gzip.open(temp_output_path, 'wb') as f:
-                f.write(tar_data.encode('utf-8', errors='replace'))
-            
-            # Atomically move to final location
-            shutil.move(temp_output_path, output_path)
+            self._write_dump(output_path, tar_data.encode('utf-8', errors='replace'))
             
             logger.info(f"Redis backup completed successfully: {output_path}")
             return True
             
         except Exception as e:
             logger.error(f"Error during Redis backup: {str(e)}")
-            # Attempt to cleanup temporary output file
-            if 'temp_output_path' in locals() and os.path.exists(temp_output_path):
-                try:
-                    os.remove(temp_output_path)
-                except Exception:
-                    pass
             return False
             
         finally:
@@ -6,14 +6,16 @@ File backup module for service-oriented Docker backup system.
 Manages application file backup operations.
 """
 
+import io
 import os
+import re
 import time
 import shutil
 import tarfile
 import fnmatch
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple, Set
+from typing import Dict, List, Any, Optional, Union, Tuple, Set, Pattern, Iterable
 
 from logger import get_logger
 from utils.docker_utils import exec_in_container, get_container_mounts
@@ -21,12 +23,69 @@ from utils.archive_utils import create_tar_gz
 
 logger = get_logger(__name__)
 
+# Read size used when streaming archives out of the Docker API
+STREAM_BUFFER_SIZE = 1 << 20
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks."""
+    
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        Initialize the reader.
+        
+        Args:
+            chunks (iterable): Byte chunks, e.g. from container.get_archive().
+        """
+        self._chunks = iter(chunks)
+        self._pending = b''
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        """
+        Fill buffer from the pending chunk, pulling the next one when empty.
+        
+        Args:
+            buffer: Writable buffer.
+            
+        Returns:
+            int: Number of bytes read, 0 at end of stream.
+        """
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b''
+                return 0
+        
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def compile_exclusions(patterns: Optional[List[str]]) -> Optional[Pattern[str]]:
+    """
+    Compile glob exclusion patterns into a single regular expression.
+    
+    Args:
+        patterns (list, optional): Glob patterns as understood by fnmatch.
+        
+    Returns:
+        Pattern: Compiled pattern matching any of the globs, or None if there are none.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
 
 class FileBackup:
     """Manages application file backup operations."""
     
     def __init__(self, container: Any, paths: Optional[List[str]] = None,
-                exclusions: Optional[List[str]] = None):
+                exclusions: Optional[List[str]] = None,
+                exclusion_re: Optional[Pattern[str]] = None):
         """
         Initialize file backup handler.
         
@@ -34,10 +93,13 @@ class FileBackup:
             container (Container): Docker container object.
             paths (list, optional): List of paths to back up.
             exclusions (list, optional): List of exclusion patterns.
+            exclusion_re (Pattern, optional): Precompiled form of ``exclusions``
+                                              from compile_exclusions().
         """
         self.container = container
         self.paths = paths or []
         self.exclusions = exclusions or []
+        self.exclusion_re = exclusion_re if exclusion_re is not None else compile_exclusions(self.exclusions)
         
         # Auto-detect paths if none provided
         if not self.paths:
@@ -136,8 +198,8 @@ class FileBackup:
                     logger.error(f"Failed to create archive: {process.stderr}")
                     return False
                     
-                # Move archive to output location
-                shutil.copy(archive_path, output_path)
+                # Move archive to output location (a rename when on the same filesystem)
+                shutil.move(archive_path, output_path)
                 logger.debug(f"Successfully backed up {path} to {output_path}")
                 
                 return True
@@ -160,9 +222,6 @@ class FileBackup:
         logger.info(f"Backing up path from stopped container {self.container.name} using Docker API: {path}")
         
         try:
-            import io
-            import tarfile
-            
             # Create a target directory based on the path name
             target_dir = os.path.join(temp_dir, os.path.basename(path) or "root")
             os.makedirs(target_dir, exist_ok=True)
@@ -176,29 +235,16 @@ class FileBackup:
                 logger.debug(f"Getting archive from container {self.container.name} path: {container_path}")
                 bits, stat = self.container.get_archive(container_path)
                 
-                # Create a file-like object from the generator
-                fileobj = io.BytesIO()
-                for chunk in bits:
-                    fileobj.write(chunk)
-                fileobj.seek(0)
-                
-                # Extract the tar data
-                with tarfile.open(fileobj=fileobj, mode='r') as tar:
+                # Extract members as the response streams in rather than buffering it all
+                fileobj = io.BufferedReader(_ChunkReader(bits), buffer_size=STREAM_BUFFER_SIZE)
+                with tarfile.open(fileobj=fileobj, mode='r|') as tar:
                     # Apply exclusion filters if needed
-                    if self.exclusions:
+                    if self.exclusion_re is not None:
                         logger.debug(f"Applying exclusions to archive: {', '.join(self.exclusions)}")
-                        for member in tar.getmembers():
-                            skip = False
-                            for pattern in self.exclusions:
-                                if fnmatch.fnmatch(member.name, pattern):
-                                    skip = True
-                                    break
-                            
-                            if not skip:
-                                tar.extract(member, path=target_dir)
-                    else:
-                        # Extract everything
-                        tar.extractall(path=target_dir)
+                    match_excluded = self.exclusion_re.match if self.exclusion_re is not None else None
+                    for member in tar:
+                        if match_excluded is None or not match_excluded(member.name):
+                            tar.extract(member, path=target_dir)
                 
                 logger.info(f"Successfully backed up path {path} from stopped container {self.container.name}")
                 return True
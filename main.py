@@ -22,7 +22,7 @@ from logger import configure_logging, get_logger, log_startup_info
 from config_manager import ConfigurationManager
 from portainer_client import PortainerClient
 from backup_manager import BackupManager
-from utils.docker_utils import validate_docker_environment
+from utils.docker_utils import validate_docker_environment, close_docker_client
 
 try:
     import schedule
@@ -505,6 +505,7 @@ def cleanup() -> None:
     
     # Add any cleanup tasks here
     time.sleep(1)  # Give pending tasks time to complete
+    close_docker_client()
     
     if logger:
         logger.info("Cleanup complete")
@@ -7,7 +7,10 @@ Handles communication with Portainer API to retrieve stack information and crede
 """
 
 import os
+import json
 import time
+import logging
+import concurrent.futures
 import requests
 from typing import Dict, List, Any, Optional, Union, Tuple
 from urllib3.exceptions import InsecureRequestWarning
@@ -41,6 +44,7 @@ class PortainerClient:
         self.read_timeout = int(os.environ.get('PORTAINER_READ_TIMEOUT', '30'))
         self.retry_total = int(os.environ.get('PORTAINER_RETRY_TOTAL', '3'))
         self.retry_backoff = float(os.environ.get('PORTAINER_RETRY_BACKOFF', '0.5'))
+        self.prefetch_workers = max(1, int(os.environ.get('PORTAINER_PREFETCH_WORKERS', '8')))
         
         self.verify_ssl = not os.environ.get('PORTAINER_INSECURE', '').lower() in ('true', '1', 'yes')
         if not self.verify_ssl:
@@ -53,9 +57,16 @@ class PortainerClient:
                    f"(connect_timeout={self.connect_timeout}s, read_timeout={self.read_timeout}s, "
                    f"retries={self.retry_total})")
         
-        # Cache for API responses
+        # Cache for API responses; entries older than the TTL are revalidated via ETag
         self._cache = {}
         self._cache_ttl = int(os.environ.get('PORTAINER_CACHE_TTL', '300'))  # 5 minutes default
+        
+        # Monotonic time of the last successful connection check (None = never)
+        self._last_ok_ts: Optional[float] = None
+        self._connection_ok_ttl = 30
+        
+        # Prepared requests for parameterless calls, keyed by (method, endpoint)
+        self._prepared: Dict[Tuple[str, str], requests.PreparedRequest] = {}
     
     def _create_session(self) -> requests.Session:
         """
@@ -87,61 +98,176 @@ class PortainerClient:
         
         return session
     
-    def _make_request(self, method: str, endpoint: str, 
+    def _cached_get(self, endpoint: str,
                     params: Optional[Dict[str, Any]] = None,
-                    data: Optional[Dict[str, Any]] = None,
-                    cache: bool = False,
                     custom_timeout: Optional[Tuple[int, int]] = None) -> Optional[Dict[str, Any]]:
         """
-        Make a request to the Portainer API with retries.
+        Make a GET request to the Portainer API, serving from the cache when fresh.
+        
+        Cache entries older than the cache TTL are revalidated with a conditional
+        request (If-None-Match) when the server supplied an ETag, so unchanged
+        resources are confirmed with a bodiless 304 instead of being re-downloaded.
+        
+        Args:
+            endpoint (str): API endpoint.
+            params (dict, optional): Query parameters.
+            custom_timeout (tuple, optional): Custom timeout as (connect_timeout, read_timeout).
+        
+        Returns:
+            dict or None: Response data or None if failed.
+        """
+        cache_key = f"GET:{endpoint}:{str(params)}"
+        cache_entry = self._cache.get(cache_key)
+        headers = None
+        
+        if cache_entry:
+            if time.time() - cache_entry["timestamp"] < self._cache_ttl:
+                logger.debug(f"Using cached response for {endpoint}")
+                return cache_entry["data"]
+            
+            # Revalidate instead of re-downloading if we have a validator
+            if cache_entry.get("etag"):
+                headers = {"If-None-Match": cache_entry["etag"]}
+        
+        response = self._send("GET", endpoint, params=params,
+                              custom_timeout=custom_timeout, headers=headers)
+        if response is None:
+            return None
+        
+        if response.status_code == 304 and cache_entry:
+            logger.debug(f"Cached response for {endpoint} revalidated (304 Not Modified)")
+            cache_entry["timestamp"] = time.time()
+            return cache_entry["data"]
+        
+        result = self._parse_response(response, endpoint)
+        
+        # Only cache successful responses
+        if result is not None:
+            self._cache[cache_key] = {
+                "etag": response.headers.get("ETag"),
+                "timestamp": time.time(),
+                "data": result
+            }
+        
+        return result
+    
+    def _parse_response(self, response: requests.Response, endpoint: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a Portainer API response body.
+        
+        Args:
+            response (requests.Response): Completed response.
+            endpoint (str): API endpoint, used for logging.
+        
+        Returns:
+            dict or None: Parsed data, empty dict for an empty body, or None if invalid.
+        """
+        if not response.content:
+            return {}
+        
+        try:
+            return response.json()
+        except ValueError as e:
+            logger.error(f"JSON parsing error for {endpoint}: {str(e)}")
+            return None
+    
+    def _prepared_request(self, method: str, endpoint: str) -> requests.PreparedRequest:
+        """
+        Get a reusable prepared request for a call without params or body.
+        
+        Args:
+            method (str): HTTP method.
+            endpoint (str): API endpoint.
+        
+        Returns:
+            requests.PreparedRequest: Prepared request with session headers merged in.
+        """
+        key = (method, endpoint)
+        prepared = self._prepared.get(key)
+        if prepared is None:
+            prepared = self.session.prepare_request(
+                requests.Request(method=method, url=f"{self.url}{endpoint}"))
+            self._prepared[key] = prepared
+        return prepared
+    
+    def _send_prepared(self, prepared: requests.PreparedRequest, stream: bool = False,
+                       timeout: Optional[Tuple[int, int]] = None) -> requests.Response:
+        """
+        Send a prepared request with the same settings ``session.request`` applies.
+        
+        ``Session.send`` skips the environment lookup, so proxies and CA
+        bundles from HTTPS_PROXY/NO_PROXY/REQUESTS_CA_BUNDLE are merged in here.
+        
+        Args:
+            prepared (requests.PreparedRequest): Request to send.
+            stream (bool): Whether to defer downloading the body.
+            timeout (tuple, optional): Timeout as (connect_timeout, read_timeout).
+        
+        Returns:
+            requests.Response: Response from the server.
+        """
+        settings = self.session.merge_environment_settings(
+            prepared.url, {}, stream, self.verify_ssl, None)
+        return self.session.send(prepared, timeout=timeout, **settings)
+    
+    def _send(self, method: str, endpoint: str,
+              params: Optional[Dict[str, Any]] = None,
+              data: Optional[Dict[str, Any]] = None,
+              custom_timeout: Optional[Tuple[int, int]] = None,
+              headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """
+        Send a request to the Portainer API with retries.
         
         Args:
             method (str): HTTP method (GET, POST, etc.)
             endpoint (str): API endpoint.
             params (dict, optional): Query parameters.
             data (dict, optional): Request body.
-            cache (bool): Whether to cache the response.
             custom_timeout (tuple, optional): Custom timeout as (connect_timeout, read_timeout).
+            headers (dict, optional): Extra request headers.
         
         Returns:
-            dict or None: Response data or None if failed.
+            requests.Response or None: Successful (or 304) response, or None if failed.
         """
         url = f"{self.url}{endpoint}"
         
         # Use custom timeout if provided, otherwise use defaults
         timeout = custom_timeout or (self.connect_timeout, self.read_timeout)
         
-        # Check cache for GET requests
-        cache_key = f"{method}:{endpoint}:{str(params)}"
-        if method == "GET" and cache and cache_key in self._cache:
-            cache_entry = self._cache[cache_key]
-            if time.time() - cache_entry["timestamp"] < self._cache_ttl:
-                logger.debug(f"Using cached response for {endpoint}")
-                return cache_entry["data"]
+        # Encode the body once so manual retries resend the same bytes
+        body = None if data is None else json.dumps(data).encode('utf-8')
         
         # Custom retry handling for non-retryable errors
         manual_retries = 2  # Manual retries for connection errors
         retry_delay = self.retry_backoff
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
         for manual_attempt in range(manual_retries + 1):
             try:
-                logger.debug(f"Making {method} request to {endpoint} (timeout={timeout}s)")
+                if debug_enabled:
+                    logger.debug(f"Making {method} request to {endpoint} (timeout={timeout}s)")
                 
                 # Add request timeout monitoring
-                start_time = time.time()
+                start_time = time.monotonic()
                 
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=data,
-                    verify=self.verify_ssl,
-                    timeout=timeout
-                )
+                if params is None and body is None and headers is None:
+                    response = self._send_prepared(self._prepared_request(method, endpoint),
+                                                   timeout=timeout)
+                else:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        data=body,
+                        headers=headers,
+                        verify=self.verify_ssl,
+                        timeout=timeout
+                    )
                 
                 # Log request duration for monitoring
-                duration = time.time() - start_time
-                logger.debug(f"Request to {endpoint} completed in {duration:.2f}s")
+                duration = time.monotonic() - start_time
+                if debug_enabled:
+                    logger.debug(f"Request to {endpoint} completed in {duration:.2f}s")
                 
                 # Check for slow requests
                 if duration > timeout[1] * 0.8:  # If took more than 80% of timeout
@@ -149,21 +275,7 @@ class PortainerClient:
                                   f"(close to timeout of {timeout[1]}s)")
                 
                 response.raise_for_status()
-                
-                # Parse response
-                if response.content:
-                    result = response.json()
-                else:
-                    result = {}
-                
-                # Cache successful GET responses if requested
-                if method == "GET" and cache:
-                    self._cache[cache_key] = {
-                        "timestamp": time.time(),
-                        "data": result
-                    }
-                
-                return result
+                return response
                 
             except requests.exceptions.ConnectTimeout as e:
                 logger.warning(f"Connection timeout on {endpoint}: {str(e)}")
@@ -195,22 +307,21 @@ class PortainerClient:
                 else:
                     logger.error(f"Failed to make request to {endpoint} after multiple attempts")
                     return None
-                
-            except ValueError as e:
-                logger.error(f"JSON parsing error for {endpoint}: {str(e)}")
-                return None
     
-    def get_stacks(self) -> Dict[str, str]:
+    def get_stacks(self, prefetch: bool = False) -> Dict[str, str]:
         """
         Get all stacks from Portainer.
         
+        Args:
+            prefetch (bool): Also fetch every stack's details concurrently so that
+                subsequent get_stack_details calls are served from the cache.
+        
         Returns:
             dict: Dictionary of stack names to stack IDs.
         """
         # Use a longer timeout for potentially large response
-        result = self._make_request("GET", "/api/stacks", 
-                                 cache=True, 
-                                 custom_timeout=(self.connect_timeout, self.read_timeout * 2))
+        result = self._cached_get("/api/stacks",
+                                  custom_timeout=(self.connect_timeout, self.read_timeout * 2))
         
         if not result:
             logger.error("Failed to get stacks from Portainer")
@@ -225,11 +336,31 @@ class PortainerClient:
                     stacks[stack_name] = str(stack_id)
             
             logger.info(f"Retrieved {len(stacks)} stacks from Portainer")
-            return stacks
-            
         except Exception as e:
             logger.error(f"Error processing stacks response: {str(e)}")
             return {}
+        
+        if prefetch and stacks:
+            self._prefetch_stack_details(list(stacks.values()))
+        
+        return stacks
+    
+    def _prefetch_stack_details(self, stack_ids: List[str]) -> None:
+        """
+        Fetch details for several stacks in parallel to warm the response cache.
+        
+        Args:
+            stack_ids (list): Stack IDs to fetch.
+        """
+        max_workers = min(self.prefetch_workers, len(stack_ids))
+        logger.debug(f"Prefetching details for {len(stack_ids)} stacks ({max_workers} workers)")
+        
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # get_stack_details stores each result in the cache; failures are logged there
+                list(executor.map(self.get_stack_details, stack_ids))
+        except Exception as e:
+            logger.warning(f"Error prefetching stack details: {str(e)}")
     
     def get_stack_env(self, stack_name: str, stacks_dict: Dict[str, str]) -> Optional[Dict[str, str]]:
         """
@@ -299,8 +430,8 @@ class PortainerClient:
         Returns:
             dict or None: Stack information or None if not found.
         """
-        # Get all stacks
-        stacks_dict = self.get_stacks()
+        # Get all stacks, warming the details cache since every stack is inspected below
+        stacks_dict = self.get_stacks(prefetch=True)
         if not stacks_dict:
             return None
         
@@ -342,7 +473,7 @@ class PortainerClient:
             dict or None: Detailed stack information or None if not found.
         """
         endpoint = f"/api/stacks/{stack_id}"
-        result = self._make_request("GET", endpoint, cache=True)
+        result = self._cached_get(endpoint)
         
         if not result:
             logger.warning(f"Failed to get details for stack ID: {stack_id}")
@@ -363,20 +494,29 @@ class PortainerClient:
         """
         Check if connection to Portainer API is working.
         
+        Uses GET, as Portainer serves /api/status for GET only. The small body
+        is read in full but not parsed; reading it lets the connection return
+        to the session pool for the next real request. A positive result is
+        reused for a short period.
+        
         Returns:
             bool: True if connection is working, False otherwise.
         """
+        if (self._last_ok_ts is not None
+                and time.monotonic() - self._last_ok_ts < self._connection_ok_ttl):
+            return True
+        
         try:
             # Use a short timeout for this check
-            result = self._make_request("GET", "/api/status", 
-                                     cache=False, 
-                                     custom_timeout=(2, 5))
+            response = self._send_prepared(self._prepared_request("GET", "/api/status"),
+                                           timeout=(2, 5))
             
-            if result:
+            if response.ok:
+                self._last_ok_ts = time.monotonic()
                 logger.info(f"Successfully connected to Portainer API")
                 return True
             else:
-                logger.error(f"Failed to connect to Portainer API")
+                logger.error(f"Failed to connect to Portainer API: HTTP {response.status_code}")
                 return False
                 
         except Exception as e:
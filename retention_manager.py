@@ -10,6 +10,8 @@ import os
 import re
 import json
 import time
+import heapq
+import concurrent.futures
 import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -19,6 +21,95 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Backup filenames have a fixed-width timestamp: <service>_<YYYYMMDD_HHMMSS>.tar.gz
+# (.tar.zst with zstd compression, .tar when members are stored as-is)
+# Checked in order, so a suffix must come before any shorter suffix it ends with
+_BACKUP_SUFFIXES = ('.tar.gz', '.tar.zst', '.tar')
+_TIMESTAMP_LEN = 16  # len('_YYYYMMDD_HHMMSS')
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+def _split_backup_filename(filename: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a backup filename into service name and raw timestamp string.
+    
+    The YYYYMMDD_HHMMSS timestamp sorts lexicographically in time order, so
+    it can be compared without parsing. Field ranges are still checked, so
+    names with impossible dates are rejected as strptime would.
+    
+    Args:
+        filename (str): Backup filename.
+        
+    Returns:
+        tuple or None: (service_name, timestamp_str) or None if the name is invalid.
+    """
+    for suffix in _BACKUP_SUFFIXES:
+        if filename.endswith(suffix):
+            stem = filename[:-len(suffix)]
+            break
+    else:
+        return None
+    
+    if len(stem) <= _TIMESTAMP_LEN or stem[-_TIMESTAMP_LEN] != '_':
+        return None
+    
+    timestamp_str = stem[-15:]  # Format: YYYYMMDD_HHMMSS
+    if not (timestamp_str[:8].isdigit() and timestamp_str[8] == '_'
+            and timestamp_str[9:].isdigit()):
+        return None
+    
+    if not _is_valid_timestamp(timestamp_str):
+        return None
+    
+    return stem[:-_TIMESTAMP_LEN], timestamp_str
+
+
+def _is_valid_timestamp(timestamp_str: str) -> bool:
+    """
+    Check the field ranges of an all-digit YYYYMMDD_HHMMSS timestamp.
+    
+    Only days past the 28th need the month's length, so strptime runs just
+    for those.
+    
+    Args:
+        timestamp_str (str): Timestamp with digits in every field.
+        
+    Returns:
+        bool: True if strptime would accept the timestamp, False otherwise.
+    """
+    day = timestamp_str[6:8]
+    if not (timestamp_str[:4] != '0000' and '01' <= timestamp_str[4:6] <= '12'
+            and '01' <= day <= '31' and timestamp_str[9:11] <= '23'
+            and timestamp_str[11:13] <= '59' and timestamp_str[13:15] <= '59'):
+        return False
+    
+    if day > '28':
+        try:
+            datetime.strptime(timestamp_str, _TIMESTAMP_FORMAT)
+        except ValueError:
+            return False
+    return True
+
+
+def _parse_backup_filename(filename: str) -> Optional[Tuple[str, datetime]]:
+    """
+    Split a backup filename into service name and timestamp.
+    
+    Args:
+        filename (str): Backup filename.
+        
+    Returns:
+        tuple or None: (service_name, timestamp) or None if the name is invalid.
+    """
+    split = _split_backup_filename(filename)
+    if not split:
+        return None
+    
+    try:
+        return split[0], datetime.strptime(split[1], _TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
 
 class RetentionManager:
     """Manages backup retention policies."""
@@ -39,11 +130,17 @@ class RetentionManager:
         self.default_count = self.config.get('count', 10)
         self.service_configs = self.config.get('services', {})
         
-        # Backup filename pattern
-        self.filename_pattern = r'^(.+)_(\d{8}_\d{6})\.tar\.gz$'
+        # Opt-in: only look at backups of services with an explicit policy, e.g.
+        # when the backup directory is shared with unrelated archives
+        self.scan_only_configured = self.config.get(
+            'scan_only_configured',
+            os.environ.get('RETENTION_SCAN_ONLY_CONFIGURED', '').lower() in ('true', '1', 'yes'))
         
-        # Ensure backup directory exists
-        os.makedirs(self.backup_dir, exist_ok=True)
+        # Services are independent, so their retention runs in parallel
+        self.max_workers = max(1, int(os.environ.get('RETENTION_MAX_WORKERS', '8')))
+        
+        # Time-based cutoffs keyed by (now, days), shared by services in a run
+        self._cutoff_cache: Dict[Tuple[datetime, int], str] = {}
         
         logger.debug(f"Initialized retention manager for {self.backup_dir}")
     
@@ -56,71 +153,113 @@ class RetentionManager:
         """
         logger.info("Applying retention policies to backups")
         
+        # Retention only prunes, so a missing directory simply means no backups
+        if not os.path.isdir(self.backup_dir):
+            logger.info(f"Backup directory {self.backup_dir} does not exist, nothing to prune")
+            return 0
+        
+        # Use a single reference time so all services see the same cutoffs
+        now = datetime.now()
+        self._cutoff_cache.clear()
+        
+        # Group backups by service name (single directory scan shared by all services)
+        service_backups = self._group_backups_by_service()
+        
         # Check for lock files to avoid removing backups in use
-        active_backups = self._get_active_backups()
+        known_backups = {name for backups in service_backups.values() for name in backups}
+        active_backups = self._get_active_backups(known_backups)
         if active_backups:
             logger.info(f"Found {len(active_backups)} active backups that will be preserved")
         
-        # Group backups by service name
-        service_backups = self._group_backups_by_service()
-        
         removed_count = 0
         
         # Apply retention policy to each service
-        for service_name, backups in service_backups.items():
-            try:
-                service_config = self.service_configs.get(service_name, {})
-                
-                if 'mixed' in service_config:
-                    # Apply mixed retention policy
-                    daily = service_config['mixed'].get('daily', 7)
-                    weekly = service_config['mixed'].get('weekly', 4)
-                    monthly = service_config['mixed'].get('monthly', 3)
-                    
-                    logger.debug(f"Applying mixed retention policy for {service_name}: "
-                               f"daily={daily}, weekly={weekly}, monthly={monthly}")
-                    
-                    service_removed = self.apply_mixed_retention(
-                        service_name, daily, weekly, monthly, active_backups)
-                    
-                elif 'days' in service_config:
-                    # Apply time-based retention
-                    days = service_config['days']
-                    logger.debug(f"Applying time-based retention for {service_name}: {days} days")
-                    service_removed = self.apply_time_based_retention(
-                        service_name, days, active_backups)
-                    
-                elif 'count' in service_config:
-                    # Apply count-based retention
-                    count = service_config['count']
-                    logger.debug(f"Applying count-based retention for {service_name}: {count} backups")
-                    service_removed = self.apply_count_based_retention(
-                        service_name, count, active_backups)
-                    
-                else:
-                    # Apply default retention (time-based)
-                    logger.debug(f"Applying default time-based retention for {service_name}: "
-                               f"{self.default_days} days")
-                    service_removed = self.apply_time_based_retention(
-                        service_name, self.default_days, active_backups)
-                
-                removed_count += service_removed
-                
-            except Exception as e:
-                logger.error(f"Error applying retention policy for {service_name}: {str(e)}")
+        if service_backups:
+            max_workers = min(self.max_workers, len(service_backups))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._apply_service_policy, service_name, backups,
+                                    active_backups, now)
+                    for service_name, backups in service_backups.items()
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    removed_count += future.result()
         
         logger.info(f"Retention policies applied, removed {removed_count} backups")
         return removed_count
     
-    def apply_time_based_retention(self, service_name: str, days: int, 
-                                 active_backups: Optional[Set[Path]] = None) -> int:
+    def _apply_service_policy(self, service_name: str, backups: List[str],
+                              active_backups: Set[str], now: datetime) -> int:
+        """
+        Apply the configured retention policy to a single service.
+        
+        Args:
+            service_name (str): Service name to apply policy to.
+            backups (list): Backup filenames belonging to the service.
+            active_backups (set): Set of active backup filenames to preserve.
+            now (datetime): Reference time for time-based retention.
+            
+        Returns:
+            int: Number of backups removed.
+        """
+        try:
+            service_config = self.service_configs.get(service_name, {})
+            
+            if 'mixed' in service_config:
+                # Apply mixed retention policy
+                daily = service_config['mixed'].get('daily', 7)
+                weekly = service_config['mixed'].get('weekly', 4)
+                monthly = service_config['mixed'].get('monthly', 3)
+                
+                logger.debug(f"Applying mixed retention policy for {service_name}: "
+                           f"daily={daily}, weekly={weekly}, monthly={monthly}")
+                
+                removed = self.apply_mixed_retention(
+                    service_name, daily, weekly, monthly, active_backups,
+                    service_backups=backups)
+            
+            elif 'days' in service_config:
+                # Apply time-based retention
+                days = service_config['days']
+                logger.debug(f"Applying time-based retention for {service_name}: {days} days")
+                removed = self.apply_time_based_retention(
+                    service_name, days, active_backups, service_backups=backups, now=now)
+            
+            elif 'count' in service_config:
+                # Apply count-based retention
+                count = service_config['count']
+                logger.debug(f"Applying count-based retention for {service_name}: {count} backups")
+                removed = self.apply_count_based_retention(
+                    service_name, count, active_backups, service_backups=backups)
+            
+            else:
+                # Apply default retention (time-based)
+                logger.debug(f"Applying default time-based retention for {service_name}: "
+                           f"{self.default_days} days")
+                removed = self.apply_time_based_retention(
+                    service_name, self.default_days, active_backups,
+                    service_backups=backups, now=now)
+            
+            return removed
+            
+        except Exception as e:
+            logger.error(f"Error applying retention policy for {service_name}: {str(e)}")
+            return 0
+    
+    def apply_time_based_retention(self, service_name: str, days: int,
+                                 active_backups: Optional[Set[str]] = None,
+                                 service_backups: Optional[List[str]] = None,
+                                 now: Optional[datetime] = None) -> int:
         """
         Apply time-based retention policy.
         
         Args:
             service_name (str): Service name to apply policy to.
             days (int): Number of days to keep backups.
-            active_backups (set, optional): Set of active backup paths to preserve.
+            active_backups (set, optional): Set of active backup filenames to preserve.
+            service_backups (list, optional): Backup filenames belonging to the service.
+                When None, the backup directory is scanned for them.
+            now (datetime, optional): Reference time for the cutoff. Defaults to now.
             
         Returns:
             int: Number of backups removed.
@@ -130,49 +269,43 @@ class RetentionManager:
             return 0
         
         active_backups = active_backups or set()
-        cutoff_date = datetime.now() - timedelta(days=days)
-        removed_count = 0
+        cutoff_str = self._get_cutoff(now or datetime.now(), days)
         
-        # Get all backups for this service
-        service_backups = self._get_service_backups(service_name)
+        if service_backups is None:
+            service_backups = self._get_service_backups(service_name)
         
-        for backup_path in service_backups:
-            try:
-                # Skip active backups
-                if backup_path in active_backups:
-                    logger.debug(f"Skipping active backup: {backup_path.name}")
-                    continue
-                
-                # Extract timestamp from filename
-                match = re.match(self.filename_pattern, backup_path.name)
-                if not match:
-                    logger.warning(f"Skipping backup with invalid filename: {backup_path.name}")
-                    continue
-                
-                # Parse timestamp
-                timestamp_str = match.group(2)  # Format: YYYYMMDD_HHMMSS
-                backup_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                
-                # Check if backup is older than cutoff date
-                if backup_date < cutoff_date:
-                    logger.info(f"Removing old backup: {backup_path.name}")
-                    os.remove(backup_path)
-                    removed_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing backup {backup_path.name}: {str(e)}")
+        # Select expired backups first; only the unlinks below can fail
+        expired_backups = []
+        for backup_name in service_backups:
+            # Skip active backups
+            if backup_name in active_backups:
+                logger.debug(f"Skipping active backup: {backup_name}")
+                continue
+            
+            # Extract timestamp from filename
+            split = _split_backup_filename(backup_name)
+            if not split:
+                logger.warning(f"Skipping backup with invalid filename: {backup_name}")
+                continue
+            
+            # Check if backup is older than cutoff date (string compare)
+            if split[1] < cutoff_str:
+                expired_backups.append(backup_name)
         
-        return removed_count
+        return self._remove_backups(service_name, expired_backups, "old backup")
     
     def apply_count_based_retention(self, service_name: str, count: int,
-                                  active_backups: Optional[Set[Path]] = None) -> int:
+                                  active_backups: Optional[Set[str]] = None,
+                                  service_backups: Optional[List[str]] = None) -> int:
         """
         Apply count-based retention policy.
         
         Args:
             service_name (str): Service name to apply policy to.
             count (int): Number of backups to keep.
-            active_backups (set, optional): Set of active backup paths to preserve.
+            active_backups (set, optional): Set of active backup filenames to preserve.
+            service_backups (list, optional): Backup filenames belonging to the service.
+                When None, the backup directory is scanned for them.
             
         Returns:
             int: Number of backups removed.
@@ -182,40 +315,36 @@ class RetentionManager:
             return 0
         
         active_backups = active_backups or set()
-        removed_count = 0
-        
-        # Get all backups for this service
-        service_backups = self._get_service_backups(service_name)
-        
-        # Sort backups by date (newest first)
-        sorted_backups = sorted(
-            service_backups,
-            key=lambda p: self._get_backup_timestamp(p.name),
-            reverse=True
-        )
+        if service_backups is None:
+            service_backups = self._get_service_backups(service_name)
+        
+        # Extract each timestamp once; the raw strings sort chronologically
+        dated_backups = []
+        for backup_name in service_backups:
+            split = _split_backup_filename(backup_name)
+            if split:
+                dated_backups.append((split[1], backup_name))
+        
+        # Keep the newest 'count' backups (partial sort), remove the rest
+        if len(dated_backups) <= count:
+            return 0
         
-        # Keep the newest 'count' backups, remove the rest
-        if len(sorted_backups) > count:
-            backups_to_remove = sorted_backups[count:]
-            
-            for backup_path in backups_to_remove:
-                try:
-                    # Skip active backups
-                    if backup_path in active_backups:
-                        logger.debug(f"Skipping active backup: {backup_path.name}")
-                        continue
-                    
-                    logger.info(f"Removing excess backup: {backup_path.name}")
-                    os.remove(backup_path)
-                    removed_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error removing backup {backup_path.name}: {str(e)}")
+        to_keep = {backup_name for _, backup_name in heapq.nlargest(count, dated_backups)}
+        backups_to_remove = []
+        for _, backup_name in dated_backups:
+            if backup_name in to_keep:
+                continue
+            # Skip active backups
+            if backup_name in active_backups:
+                logger.debug(f"Skipping active backup: {backup_name}")
+                continue
+            backups_to_remove.append(backup_name)
         
-        return removed_count
+        return self._remove_backups(service_name, backups_to_remove, "excess backup")
     
     def apply_mixed_retention(self, service_name: str, daily_count: int, weekly_count: int,
-                            monthly_count: int, active_backups: Optional[Set[Path]] = None) -> int:
+                            monthly_count: int, active_backups: Optional[Set[str]] = None,
+                            service_backups: Optional[List[str]] = None) -> int:
         """
         Apply mixed retention policy.
         
@@ -224,102 +353,116 @@ class RetentionManager:
             daily_count (int): Number of daily backups to keep.
             weekly_count (int): Number of weekly backups to keep.
             monthly_count (int): Number of monthly backups to keep.
-            active_backups (set, optional): Set of active backup paths to preserve.
+            active_backups (set, optional): Set of active backup filenames to preserve.
+            service_backups (list, optional): Backup filenames belonging to the service.
+                When None, the backup directory is scanned for them.
             
         Returns:
             int: Number of backups removed.
         """
         active_backups = active_backups or set()
-        removed_count = 0
-        
-        # Get all backups for this service
-        service_backups = self._get_service_backups(service_name)
+        if service_backups is None:
+            service_backups = self._get_service_backups(service_name)
         
-        # Group backups by day, week, and month
+        # Track the newest backup per day, week, and month in a single pass,
+        # skipping tiers that keep nothing
         daily_backups = {}
         weekly_backups = {}
         monthly_backups = {}
-        
-        for backup_path in service_backups:
-            timestamp = self._get_backup_timestamp(backup_path.name)
+        build_daily = daily_count > 0
+        build_weekly = weekly_count > 0
+        build_monthly = monthly_count > 0
+        
+        def keep_newest(buckets: Dict[Tuple[int, ...], Tuple[datetime, str]],
+                        key: Tuple[int, ...], entry: Tuple[datetime, str]) -> None:
+            current = buckets.get(key)
+            if current is None or entry > current:
+                buckets[key] = entry
+        
+        dated_names = []
+        for backup_name in service_backups:
+            timestamp = self._get_backup_timestamp(backup_name)
             if not timestamp:
                 continue
             
-            # Group by day
-            day_key = timestamp.strftime("%Y-%m-%d")
-            if day_key not in daily_backups:
-                daily_backups[day_key] = []
-            daily_backups[day_key].append(backup_path)
-            
-            # Group by week
-            week_key = f"{timestamp.year}-W{timestamp.strftime('%V')}"
-            if week_key not in weekly_backups:
-                weekly_backups[week_key] = []
-            weekly_backups[week_key].append(backup_path)
-            
-            # Group by month
-            month_key = timestamp.strftime("%Y-%m")
-            if month_key not in monthly_backups:
-                monthly_backups[month_key] = []
-            monthly_backups[month_key].append(backup_path)
-        
-        # Sort groups by date
-        sorted_days = sorted(daily_backups.keys(), reverse=True)
-        sorted_weeks = sorted(weekly_backups.keys(), reverse=True)
-        sorted_months = sorted(monthly_backups.keys(), reverse=True)
-        
-        # For each day, keep the newest backup for that day
+            dated_names.append(backup_name)
+            entry = (timestamp, backup_name)
+            if build_daily:
+                keep_newest(daily_backups, (timestamp.year, timestamp.month, timestamp.day), entry)
+            if build_weekly:
+                iso_year, iso_week, _ = timestamp.isocalendar()
+                keep_newest(weekly_backups, (iso_year, iso_week), entry)
+            if build_monthly:
+                keep_newest(monthly_backups, (timestamp.year, timestamp.month), entry)
+        
+        # Keep the newest backup of the most recent days, weeks, and months
         to_keep = set()
-        for day in sorted_days[:daily_count]:
-            newest = sorted(daily_backups[day], 
-                          key=lambda p: self._get_backup_timestamp(p.name),
-                          reverse=True)[0]
-            to_keep.add(newest)
-        
-        # For each week, keep the newest backup for that week
-        for week in sorted_weeks[:weekly_count]:
-            newest = sorted(weekly_backups[week],
-                          key=lambda p: self._get_backup_timestamp(p.name),
-                          reverse=True)[0]
-            to_keep.add(newest)
-        
-        # For each month, keep the newest backup for that month
-        for month in sorted_months[:monthly_count]:
-            newest = sorted(monthly_backups[month],
-                          key=lambda p: self._get_backup_timestamp(p.name),
-                          reverse=True)[0]
-            to_keep.add(newest)
+        for buckets, keep_count in ((daily_backups, daily_count),
+                                    (weekly_backups, weekly_count),
+                                    (monthly_backups, monthly_count)):
+            for _, backup_name in heapq.nlargest(keep_count, buckets.values()):
+                to_keep.add(backup_name)
         
         # Remove backups not in the keep set
-        for backup_path in service_backups:
-            if backup_path not in to_keep and backup_path not in active_backups:
-                try:
-                    logger.info(f"Removing backup under mixed policy: {backup_path.name}")
-                    os.remove(backup_path)
-                    removed_count += 1
-                except Exception as e:
-                    logger.error(f"Error removing backup {backup_path.name}: {str(e)}")
+        backups_to_remove = [backup_name for backup_name in dated_names
+                             if backup_name not in to_keep and backup_name not in active_backups]
         
-        return removed_count
+        return self._remove_backups(service_name, backups_to_remove, "backup under mixed policy")
     
-    def _get_service_backups(self, service_name: str) -> List[Path]:
+    def _remove_backups(self, service_name: str, backup_names: List[str], description: str) -> int:
         """
-        Get all backups for a specific service.
+        Remove backup files from the backup directory.
+        
+        Per-file messages are logged at debug level; a single summary line is
+        logged per service.
         
         Args:
-            service_name (str): Service name.
+            service_name (str): Service the backups belong to.
+            backup_names (list): Backup filenames to remove.
+            description (str): Kind of backup being removed, used for logging.
             
         Returns:
-            list: List of backup paths.
+            int: Number of backups removed.
         """
-        backups = []
-        pattern = f"{service_name}_*.tar.gz"
+        if not backup_names:
+            return 0
         
-        for backup_path in self.backup_dir.glob(pattern):
-            if backup_path.is_file():
-                backups.append(backup_path)
+        removed_count = 0
         
-        return backups
+        # Unlink relative to an open directory fd to skip per-file path lookups
+        dir_fd = os.open(self.backup_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for backup_name in backup_names:
+                logger.debug(f"Removing {description}: {backup_name}")
+                try:
+                    os.unlink(backup_name, dir_fd=dir_fd)
+                except OSError as e:
+                    logger.error(f"Error removing backup {backup_name}: {str(e)}")
+                    continue
+                removed_count += 1
+        finally:
+            os.close(dir_fd)
+        
+        logger.info(f"Removed {removed_count} backups for {service_name}")
+        return removed_count
+    
+    def _get_cutoff(self, now: datetime, days: int) -> str:
+        """
+        Get the time-based retention cutoff, reusing it across services.
+        
+        Args:
+            now (datetime): Reference time.
+            days (int): Number of days to keep backups.
+            
+        Returns:
+            str: Cutoff as YYYYMMDD_HHMMSS; backups with older timestamps are expired.
+        """
+        key = (now, days)
+        cutoff = self._cutoff_cache.get(key)
+        if cutoff is None:
+            cutoff = (now - timedelta(days=days)).strftime(_TIMESTAMP_FORMAT)
+            self._cutoff_cache[key] = cutoff
+        return cutoff
     
     def _get_backup_timestamp(self, filename: str) -> Optional[datetime]:
         """
@@ -331,53 +474,95 @@ class RetentionManager:
         Returns:
             datetime or None: Backup timestamp or None if invalid.
         """
-        match = re.match(self.filename_pattern, filename)
-        if not match:
-            return None
+        parsed = _parse_backup_filename(filename)
+        return parsed[1] if parsed else None
+    
+    def _get_service_backups(self, service_name: str) -> List[str]:
+        """
+        Get all backups for a specific service.
         
-        try:
-            timestamp_str = match.group(2)  # Format: YYYYMMDD_HHMMSS
-            return datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-        except Exception:
-            return None
+        Args:
+            service_name (str): Service name.
+            
+        Returns:
+            list: Backup filenames.
+        """
+        backups = []
+        with os.scandir(self.backup_dir) as it:
+            for entry in it:
+                split = _split_backup_filename(entry.name)
+                if split and split[0] == service_name:
+                    backups.append(entry.name)
+        return backups
     
-    def _group_backups_by_service(self) -> Dict[str, List[Path]]:
+    def _group_backups_by_service(self) -> Dict[str, List[str]]:
         """
         Group backup files by service name.
         
+        When scan_only_configured is set, backups of services without a
+        configured policy are skipped.
+        
         Returns:
             dict: Dictionary of service names to backup lists.
         """
         service_backups = {}
         
-        for backup_path in self.backup_dir.glob("*.tar.gz"):
-            match = re.match(self.filename_pattern, backup_path.name)
-            if match:
-                service_name = match.group(1)
-                if service_name not in service_backups:
-                    service_backups[service_name] = []
-                service_backups[service_name].append(backup_path)
+        configured = None
+        if self.scan_only_configured:
+            configured = set(self.service_configs)
+            if not configured:
+                return service_backups
+            prefixes = tuple(f"{name}_" for name in configured)
+        
+        with os.scandir(self.backup_dir) as it:
+            for entry in it:
+                name = entry.name
+                if configured is not None and not name.startswith(prefixes):
+                    continue
+                split = _split_backup_filename(name)
+                if split:
+                    service_name = split[0]
+                    if configured is not None and service_name not in configured:
+                        continue
+                    if service_name not in service_backups:
+                        service_backups[service_name] = []
+                    service_backups[service_name].append(name)
         
         return service_backups
     
-    def _get_active_backups(self) -> Set[Path]:
+    def _get_active_backups(self, known_backups: Optional[Set[str]] = None) -> Set[str]:
         """
         Get set of backups that are currently in use.
         
+        Args:
+            known_backups (set, optional): Backup filenames already found in the
+                backup directory. Lock targets are checked against this set instead
+                of being stat'ed individually.
+            
         Returns:
-            set: Set of active backup paths.
+            set: Set of active backup filenames.
         """
         active_backups = set()
         
         # Check for lock files
-        for lock_file in self.backup_dir.glob("*.lock"):
-            try:
-                with open(lock_file, 'r') as f:
-                    backup_name = f.read().strip()
-                    backup_path = self.backup_dir / backup_name
-                    if backup_path.exists():
-                        active_backups.add(backup_path)
-            except Exception as e:
-                logger.error(f"Error reading lock file {lock_file}: {str(e)}")
+        with os.scandir(self.backup_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.lock'):
+                    continue
+                try:
+                    # Lock files hold a single short name; read it without buffered IO
+                    fd = os.open(entry.path, os.O_RDONLY)
+                    try:
+                        data = os.read(fd, 4096)
+                    finally:
+                        os.close(fd)
+                    backup_name = data.decode('utf-8', 'replace').strip()
+                    if known_backups is not None:
+                        if backup_name in known_backups:
+                            active_backups.add(backup_name)
+                    elif os.path.exists(os.path.join(self.backup_dir, backup_name)):
+                        active_backups.add(backup_name)
+                except Exception as e:
+                    logger.error(f"Error reading lock file {entry.path}: {str(e)}")
         
         return active_backups
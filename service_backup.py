@@ -7,27 +7,201 @@ Manages backup process for a specific service.
 """
 
 import os
+import re
 import json
 import time
+import threading
+import concurrent.futures
+import socket
+import functools
+import collections
+import contextlib
 import tempfile
 import shutil
+import shlex
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import BinaryIO, Dict, List, Any, Optional, Union, Tuple, Iterator, FrozenSet, Set
 
 from logger import get_logger
 from database_backup import DatabaseBackup
-from file_backup import FileBackup
-from utils.docker_utils import get_container_environment
-from utils.archive_utils import create_tar_gz
+from file_backup import FileBackup, compile_exclusions
+from utils.credential_utils import mask_sensitive_data
+from utils.docker_utils import (get_container_environment, get_container_mounts,
+                                get_container_statuses)
+from utils.archive_utils import (create_tar_gz_from_paths, create_tar_zst_from_paths,
+                                 create_tar_from_paths, ZSTD_PATH, PRECOMPRESSED_SUFFIXES)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
 
 logger = get_logger(__name__)
 
+# Final archive extension, writer, level override variable and default level per compressor
+_ARCHIVE_FORMATS = {
+    'gzip': ('tar.gz', create_tar_gz_from_paths, None, 6),
+    'zstd': ('tar.zst', create_tar_zst_from_paths, 'BACKUP_ZSTD_LEVEL', 3),
+    'none': ('tar', create_tar_from_paths, None, 0),
+}
+
+# Multithreaded zstd is the default when installed; it is several times faster than gzip
+DEFAULT_COMPRESSOR = 'zstd' if ZSTD_PATH else 'gzip'
+
+# Upper bound on concurrent stop/start requests sent to the Docker daemon
+MAX_LIFECYCLE_WORKERS = 16
+
+# Image name fragments that identify database containers
+DB_IMAGE_TOKENS = ("postgres", "mysql", "mariadb", "mongo", "redis", "sqlite")
+_DB_IMAGE_RE = re.compile("|".join(map(re.escape, DB_IMAGE_TOKENS)), re.IGNORECASE)
+
+# Images whose containers can be backed up without stopping them
+_HOT_BACKUP_IMAGE_RE = re.compile(r'postgres|mysql|mariadb|mongodb|redis', re.IGNORECASE)
+_HOT_BACKUP_LABEL_IMAGE_RE = re.compile(r'postgres|mysql|mariadb|mongo|redis', re.IGNORECASE)
+
+# Host paths that are never backed up as bind mounts
+_SYSTEM_DIRS = frozenset([
+    "/proc", "/sys", "/dev", "/run", "/var/run",
+    "/var/lock", "/tmp", "/var/tmp", "/var/cache",
+    "/etc/hostname", "/etc/hosts", "/etc/resolv.conf",
+    "/mnt/media", "/media", "/backups", "/mnt/backups"
+])
+_SYSTEM_DIR_PREFIXES = tuple(sys_dir + "/" for sys_dir in _SYSTEM_DIRS)
+
+# Full container id in /proc/self/cgroup (v1 "/docker/<id>", v2 "docker-<id>.scope")
+_CGROUP_CONTAINER_ID_RE = re.compile(r'[0-9a-f]{64}')
+# Container id in /proc/self/mountinfo, e.g. "/var/lib/docker/containers/<id>/hostname"
+_MOUNTINFO_CONTAINER_ID_RE = re.compile(r'/containers/([0-9a-f]{64})/')
+# Docker sets HOSTNAME to the 12-character short id unless a hostname is configured
+_SHORT_CONTAINER_ID_RE = re.compile(r'[0-9a-f]{12}')
+
+
+def _dump_metadata(metadata: Dict[str, Any]) -> bytes:
+    """
+    Serialize backup metadata as indented JSON.
+    
+    Uses orjson when installed and falls back to the standard library.
+    
+    Args:
+        metadata (dict): Metadata to serialize.
+        
+    Returns:
+        bytes: UTF-8 encoded JSON document.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(metadata, indent=2).encode('utf-8')
+
+
+def _metadata_members(metadata: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+    """
+    Encode metadata as archive members.
+    
+    metadata.json is always produced for humans; metadata.msgpack is added
+    for restore tooling when msgpack is installed.
+    
+    Args:
+        metadata (dict): Metadata to serialize.
+        
+    Returns:
+        list: (filename, data) tuples.
+    """
+    members = [("metadata.json", _dump_metadata(metadata))]
+    if MSGPACK_AVAILABLE:
+        members.append(("metadata.msgpack", msgpack.packb(metadata, use_bin_type=True)))
+    return members
+
+
+@functools.lru_cache(maxsize=256)
+def _classify_db_containers(containers: Tuple[Tuple[str, str, str], ...],
+                            name_patterns: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Classify containers as databases by image and configured name patterns.
+    
+    Memoized on the container snapshot, so repeated runs over an unchanged
+    service skip the matching entirely.
+    
+    Args:
+        containers (tuple): (id, image, name) tuples.
+        name_patterns (tuple): Configured container name patterns (``*`` is ignored).
+        
+    Returns:
+        frozenset: Ids of the database containers.
+    """
+    name_re = re.compile(
+        "|".join(re.escape(pattern.replace('*', '')) for pattern in name_patterns),
+        re.IGNORECASE) if name_patterns else None
+    search_image = _DB_IMAGE_RE.search
+    search_name = name_re.search if name_re is not None else None
+    
+    # Check by image name first, then against configured patterns
+    return frozenset(
+        container_id for container_id, image, name in containers
+        if (image and search_image(image)) or (search_name and search_name(name)))
+
+
+@functools.lru_cache(maxsize=None)
+def _current_container_identifiers() -> Dict[str, str]:
+    """
+    Get identifiers for the current container.
+    
+    These cannot change while the process runs, so they are read once and
+    shared by every service backup.
+    
+    Returns:
+        dict: Dictionary with hostname, container ID, and name.
+    """
+    identifiers = {}
+    
+    # Get hostname
+    try:
+        identifiers['hostname'] = socket.gethostname()
+    except Exception as e:
+        logger.debug(f"Could not determine hostname: {str(e)}")
+    
+    # Get container ID, falling back to mountinfo where cgroup v2 hides it
+    container_id = ''
+    try:
+        match = _CGROUP_CONTAINER_ID_RE.search(Path('/proc/self/cgroup').read_text())
+        if match:
+            container_id = match.group(0)
+    except Exception as e:
+        logger.debug(f"Could not read /proc/self/cgroup: {str(e)}")
+    
+    if not container_id:
+        try:
+            match = _MOUNTINFO_CONTAINER_ID_RE.search(Path('/proc/self/mountinfo').read_text())
+            if match:
+                container_id = match.group(1)
+        except Exception as e:
+            logger.debug(f"Could not read /proc/self/mountinfo: {str(e)}")
+    
+    # Get environment variables that might indicate container name
+    identifiers['container_name'] = os.environ.get('HOSTNAME', '')
+    
+    if container_id:
+        identifiers['container_id'] = container_id
+    elif _SHORT_CONTAINER_ID_RE.fullmatch(identifiers['container_name']):
+        identifiers['container_short_id'] = identifiers['container_name']
+    else:
+        logger.debug("Could not determine container ID")
+    
+    return identifiers
+
 
 class ServiceBackup:
     """Manages backup process for a specific service."""
     
-    def __init__(self, service_name: str, containers: List[Any], config: Dict[str, Any]):
+    def __init__(self, service_name: str, containers: List[Any], config: Dict[str, Any],
+                 temp_root: Optional[str] = None):
         """
         Initialize service backup handler.
         
@@ -35,23 +209,104 @@ class ServiceBackup:
             service_name (str): Name of the service.
             containers (list): List of container objects.
             config (dict): Service configuration.
+            temp_root (str, optional): Parent directory for the working directory.
+                                       When None a private temporary directory is used.
         """
         self.service_name = service_name
         self.containers = containers
         self.config = config
+        self.temp_root = temp_root
+        
+        # Disk space budget for container_cp backups, guarded for parallel workers
+        self._available_bytes = 0
+        self._disk_budget = 0
+        self._disk_reservations = 0
+        self._disk_cond = threading.Condition()
         
         # Get service-specific configuration
         self.db_config = config.get('database', {})
         self.files_config = config.get('files', {})
         self.global_config = config.get('global', {})
         
-        # Identify database and application containers
-        self.db_containers = self._identify_db_containers()
-        self.app_containers = self._identify_app_containers()
+        # Number of mounts/containers archived concurrently
+        self.backup_parallelism = max(1, int(self.global_config.get(
+            'parallel_workers',
+            os.environ.get('BACKUP_PARALLELISM', min(8, os.cpu_count() or 1)))))
+        
+        # Spool database dumps and write them straight into the archive
+        self.streaming_archive = bool(self.global_config.get('streaming_archive', False))
+        self._db_members: List[Tuple[str, BinaryIO]] = []
+        
+        # Identity of the backup container itself, resolved once
+        identifiers = self._get_current_container_identifiers()
+        backup_names = frozenset(
+            name.strip() for name in
+            os.environ.get('BACKUP_SERVICE_NAMES', 'container-backup,backup').split(',')
+            if name.strip())
+        self._self_id = identifiers.get('container_id', '')
+        self._self_short_id = identifiers.get('container_short_id', '')
+        self._self_names = backup_names | frozenset(
+            name for name in (identifiers.get('hostname'), identifiers.get('container_name')) if name)
+        self._self_name_prefixes = tuple(f"{name}_" for name in backup_names)
+        
+        # Exclusion globs compiled once and shared by every FileBackup
+        self._file_exclusions = config.get('file_exclusions', [])
+        self._file_exclusion_re = compile_exclusions(self._file_exclusions)
+        self._app_exclusions = self.files_config.get('exclusions', [])
+        self._app_exclusion_re = compile_exclusions(self._app_exclusions)
+        
+        # Bind mounts to stream into the final archive as (source, arcname)
+        self._mount_entries: List[Tuple[str, str]] = []
+        
+        # Normalized mounts per container id, filled on first use
+        self._mounts_cache: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # Inspect payload per container id, filled on first use
+        self._inspect_cache: Dict[str, Dict[str, Any]] = {}
         
         logger.info(f"Initialized service backup for {service_name} with "
-                  f"{len(self.db_containers)} database and {len(self.app_containers)} "
-                  f"application containers")
+                  f"{len(containers)} containers")
+    
+    @functools.cached_property
+    def db_containers(self) -> List[Any]:
+        """
+        Database containers in the service, identified on first access.
+        
+        Returns:
+            list: List of database container objects.
+        """
+        return self._identify_db_containers()
+    
+    @functools.cached_property
+    def _db_container_ids(self) -> FrozenSet[str]:
+        """
+        Ids of the database containers, for membership tests.
+        
+        Returns:
+            frozenset: Database container ids.
+        """
+        return frozenset(c.id for c in self.db_containers)
+    
+    @functools.cached_property
+    def _container_snapshots(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Name, id, image and status of every container, read once per service.
+        
+        Returns:
+            list: (name, id, image, status) tuples.
+        """
+        return [(c.name, c.id, self._container_image(c) or "unknown", self._container_status(c))
+                for c in self.containers]
+    
+    @functools.cached_property
+    def app_containers(self) -> List[Any]:
+        """
+        Application containers in the service, identified on first access.
+        
+        Returns:
+            list: List of application container objects.
+        """
+        return self._identify_app_containers()
     
     def backup(self) -> bool:
         """
@@ -60,25 +315,37 @@ class ServiceBackup:
         Returns:
             bool: True if successful, False otherwise.
         """
+        if self.global_config.get('exclude_from_backup', False):
+            logger.info(f"Service {self.service_name} is excluded from backup")
+            return True
+        
+        # Nothing to dump or copy, so skip setting up a working directory at all;
+        # an empty service is not a failure
+        if not self.db_containers and not self.app_containers:
+            logger.warning(f"No containers to back up for service {self.service_name}, skipping")
+            return True
+        
         logger.info(f"Starting backup for service: {self.service_name}")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock read so the archive name and metadata agree
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        
+        # Determine backup method
+        backup_method = os.environ.get('BACKUP_METHOD', 'mounts').lower()
+        logger.info(f"Using backup method: {backup_method}")
+        
+        # Determine if stopping containers is required
+        requires_stopping = self.config.get('requires_stopping', False)
+        if backup_method == 'container_cp':
+            # Container cp method may require stopping for consistency
+            requires_stopping = True
         
         try:
             # Create temporary directory for backup
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with self._working_directory() as temp_dir:
                 logger.debug(f"Created temporary directory for backup: {temp_dir}")
                 success = True
                 
-                # Determine backup method
-                backup_method = os.environ.get('BACKUP_METHOD', 'mounts').lower()
-                logger.info(f"Using backup method: {backup_method}")
-                
-                # Determine if stopping containers is required
-                requires_stopping = self.config.get('requires_stopping', False)
-                if backup_method == 'container_cp':
-                    # Container cp method may require stopping for consistency
-                    requires_stopping = True
-                
                 # Stop containers if required
                 stopped_containers = []
                 if requires_stopping:
@@ -87,27 +354,31 @@ class ServiceBackup:
                         logger.warning("No containers were stopped, backup may be inconsistent")
                 
                 try:
-                    # Backup databases
-                    if self.db_containers:
-                        logger.info(f"Backing up {len(self.db_containers)} databases")
-                        db_success = self._backup_databases(temp_dir)
-                        success = success and db_success
-                    
-                    # Backup application data based on backup method
-                    if backup_method == 'mounts':
-                        # Use bind mounts for backup
-                        logger.info("Using bind mounts for application data backup")
-                        app_success = self._backup_bind_mounts(temp_dir)
-                    else:  # container_cp
-                        # Use docker cp for backup
-                        logger.info("Using docker cp for application data backup")
-                        app_success = self._backup_container_data(temp_dir)
-                    
-                    success = success and app_success
+                    # Database dumps and application data are independent, so run them together
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                        futures = []
+                        
+                        # Backup databases
+                        if self.db_containers:
+                            logger.info(f"Backing up {len(self.db_containers)} databases")
+                            futures.append(executor.submit(self._backup_databases, temp_dir))
+                        
+                        # Backup application data based on backup method
+                        if backup_method == 'mounts':
+                            # Use bind mounts for backup
+                            logger.info("Using bind mounts for application data backup")
+                            futures.append(executor.submit(self._backup_bind_mounts, temp_dir))
+                        else:  # container_cp
+                            # Use docker cp for backup
+                            logger.info("Using docker cp for application data backup")
+                            futures.append(executor.submit(self._backup_container_data, temp_dir))
+                        
+                        for future in concurrent.futures.as_completed(futures):
+                            success = future.result() and success
                     
                     # Create final archive if any data was backed up
                     if success and (self.db_containers or backup_method != 'none'):
-                        archive_path = self._create_archive(temp_dir, timestamp)
+                        archive_path = self._create_archive(temp_dir, timestamp, now)
                         if not archive_path:
                             logger.error("Failed to create final archive")
                             success = False
@@ -117,11 +388,102 @@ class ServiceBackup:
                     # Always restart containers that were stopped
                     if stopped_containers:
                         self._start_containers(stopped_containers)
+                    
+                    # Release spooled database dumps
+                    for _, dump_file in self._db_members:
+                        dump_file.close()
+                    self._db_members = []
                         
         except Exception as e:
             logger.error(f"Error during backup of {self.service_name}: {str(e)}")
             return False
 
+    @contextlib.contextmanager
+    def _working_directory(self) -> Iterator[str]:
+        """
+        Provide a scratch directory for a single backup run.
+        
+        Uses a subdirectory of ``temp_root`` when one was supplied by the
+        orchestrator, otherwise a private temporary directory.
+        
+        Yields:
+            str: Path to the working directory.
+        """
+        if not self.temp_root:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                yield temp_dir
+            return
+        
+        temp_dir = tempfile.mkdtemp(prefix=f"{self.service_name}_", dir=self.temp_root)
+        try:
+            yield temp_dir
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def _inspect(self, container: Any) -> Dict[str, Any]:
+        """
+        Get the inspect payload for a container, fetching it at most once.
+        
+        Containers returned by ``containers.list`` already carry the full
+        payload in ``attrs``; the API is only queried when it is missing.
+        
+        Args:
+            container: Container object.
+            
+        Returns:
+            dict: Inspect payload, empty if it could not be retrieved.
+        """
+        cached = self._inspect_cache.get(container.id)
+        if cached is not None:
+            return cached
+        
+        attrs = getattr(container, 'attrs', None)
+        if not isinstance(attrs, dict) or 'Config' not in attrs:
+            try:
+                attrs = container.client.api.inspect_container(container.id)
+            except Exception as e:
+                logger.debug(f"Could not inspect container {container.id}: {str(e)}")
+                attrs = {}
+        
+        self._inspect_cache[container.id] = attrs
+        return attrs
+    
+    def _container_labels(self, container: Any) -> Dict[str, str]:
+        """
+        Get container labels from the cached inspect payload.
+        
+        Args:
+            container: Container object.
+            
+        Returns:
+            dict: Container labels.
+        """
+        return (self._inspect(container).get('Config') or {}).get('Labels') or {}
+    
+    def _container_image(self, container: Any) -> str:
+        """
+        Get the image reference a container was created from.
+        
+        Args:
+            container: Container object.
+            
+        Returns:
+            str: Image reference, empty if unknown.
+        """
+        return (self._inspect(container).get('Config') or {}).get('Image') or ''
+    
+    def _container_status(self, container: Any) -> str:
+        """
+        Get container status from the cached inspect payload.
+        
+        Args:
+            container: Container object.
+            
+        Returns:
+            str: Container status, empty if unknown.
+        """
+        return (self._inspect(container).get('State') or {}).get('Status') or ''
+    
     def _is_system_directory(self, path: str) -> bool:
         """
         Check if a path is a system directory that should be excluded.
@@ -132,14 +494,7 @@ class ServiceBackup:
         Returns:
             bool: True if system directory, False otherwise.
         """
-        system_dirs = [
-            "/proc", "/sys", "/dev", "/run", "/var/run", 
-            "/var/lock", "/tmp", "/var/tmp", "/var/cache",
-            "/etc/hostname", "/etc/hosts", "/etc/resolv.conf",
-            "/mnt/media", "/media", "/backups", "/mnt/backups"
-        ]
-        
-        return any(path == sys_dir or path.startswith(sys_dir + "/") for sys_dir in system_dirs)
+        return path in _SYSTEM_DIRS or path.startswith(_SYSTEM_DIR_PREFIXES)
 
     def _get_unique_bind_mounts(self) -> List[Dict[str, str]]:
         """
@@ -155,8 +510,7 @@ class ServiceBackup:
         for container in self.containers:
             try:
                 # Get mounts for this container
-                from utils.docker_utils import get_container_mounts
-                mounts = get_container_mounts(container)
+                mounts = self._get_mounts(container)
                 
                 # Filter for bind mounts
                 for mount in mounts:
@@ -179,10 +533,34 @@ class ServiceBackup:
         
         return unique_mounts
 
+    def _get_mounts(self, container: Any) -> List[Dict[str, Any]]:
+        """
+        Get normalized mounts for a container, memoized by container id.
+        
+        Args:
+            container: Container object.
+            
+        Returns:
+            list: List of mount dictionaries.
+        """
+        container_id = getattr(container, 'id', None)
+        if container_id is None:
+            return get_container_mounts(container)
+        
+        mounts = self._mounts_cache.get(container_id)
+        if mounts is None:
+            mounts = get_container_mounts(container)
+            self._mounts_cache[container_id] = mounts
+        return mounts
+    
     def _backup_bind_mounts(self, backup_dir: str) -> bool:
         """
         Back up bind mounts with path exclusion support.
         
+        Mounts are not archived individually; they are collected here and
+        streamed directly into the final service archive by _create_archive,
+        so each byte is compressed and written only once.
+        
         Args:
             backup_dir (str): Directory to store backups.
             
@@ -190,6 +568,7 @@ class ServiceBackup:
             bool: True if successful, False otherwise.
         """
         logger.info(f"Backing up bind mounts for service: {self.service_name}")
+        self._mount_entries = []
         
         # Find all unique bind mounts across containers
         bind_mounts = self._get_unique_bind_mounts()
@@ -201,8 +580,9 @@ class ServiceBackup:
         
         logger.debug(f"Found {len(bind_mounts)} unique bind mounts")
         
-        # Back up each bind mount
+        # Assign each mount a unique directory name inside the archive
         success = True
+        used_names = set()
         for mount in bind_mounts:
             source = mount.get('source', '')
             destination = mount.get('destination', '')
@@ -214,29 +594,20 @@ class ServiceBackup:
                 logger.warning(f"Empty source in mount, skipping: {mount}")
                 continue
             
-            # Directly create a tar archive of the source path
-            try:
-                # Create output path for this mount
-                mount_name = os.path.basename(source)
-                output_path = os.path.join(backup_dir, f"mount_{mount_name}.tar.gz")
-                
-                # Use archive_utils directly instead of FileBackup
-                logger.debug(f"Backing up bind mount {source} to {output_path}")
-                from utils.archive_utils import create_tar_gz
-                
-                # Get exclusions from config
-                exclusions = self.files_config.get('exclusions', [])
-                
-                # Create archive 
-                if create_tar_gz(source, output_path, exclusions):
-                    logger.info(f"Successfully backed up bind mount: {source}")
-                else:
-                    logger.error(f"Failed to back up bind mount: {source}")
-                    success = False
-                    
-            except Exception as e:
-                logger.error(f"Error backing up bind mount {source}: {str(e)}")
+            if not os.path.exists(source):
+                logger.error(f"Failed to back up bind mount, source does not exist: {source}")
                 success = False
+                continue
+            
+            mount_name = os.path.basename(source)
+            unique_name = mount_name
+            suffix = 1
+            while unique_name in used_names:
+                unique_name = f"{mount_name}_{suffix}"
+                suffix += 1
+            used_names.add(unique_name)
+            
+            self._mount_entries.append((source, f"mounts/{unique_name}"))
         
         return success
     
@@ -257,41 +628,119 @@ class ServiceBackup:
             logger.error("Insufficient disk space for container data backup")
             return False
         
-        # Back up each app container
+        # Set size limit for container backup (default 1GB)
+        max_size = int(os.environ.get('MAX_CONTAINER_BACKUP_SIZE', 1024)) * 1024 * 1024
+        
+        containers = [c for c in self.app_containers if hasattr(c, 'name')]
+        if not containers:
+            return True
+        
+        # Back up app containers concurrently
         success = True
-        for container in self.app_containers:
-            if not hasattr(container, 'name'):
-                continue
-                
-            container_name = container.name
-            logger.info(f"Backing up container data for: {container_name}")
+        max_workers = min(self.backup_parallelism, len(containers))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._backup_single_container, container, backup_dir, max_size)
+                for container in containers
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                if not future.result():
+                    success = False
+        
+        return success
+    
+    def _backup_single_container(self, container: Any, backup_dir: str, max_size: int) -> bool:
+        """
+        Back up the filesystem of a single container using docker cp.
+        
+        Args:
+            container: Container object.
+            backup_dir (str): Directory to store backups.
+            max_size (int): Maximum backup size in bytes.
             
-            # Create output path for this container
-            output_path = os.path.join(backup_dir, f"container_{container_name}.tar.gz")
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        container_name = container.name
+        logger.info(f"Backing up container data for: {container_name}")
+        
+        # Reserve the worst-case size up front so concurrent workers cannot overcommit
+        reserved = self._reserve_disk_space(max_size, container_name)
+        
+        output_path = os.path.join(backup_dir, f"container_{container_name}.tar.gz")
+        try:
             
             # Create a FileBackup instance with exclusions
             file_backup = FileBackup(
                 container=container,
                 paths=["/"],  # Back up entire container
-                exclusions=self.config.get('file_exclusions', [])
+                exclusions=self._file_exclusions,
+                exclusion_re=self._file_exclusion_re
             )
-            
-            # Set size limit for container backup (default 1GB)
-            max_size = int(os.environ.get('MAX_CONTAINER_BACKUP_SIZE', 1024)) * 1024 * 1024
             file_backup.max_size = max_size
             
             # Backup the container
-            container_success = file_backup.backup_container(output_path)
-            if not container_success:
+            if not file_backup.backup_container(output_path):
                 logger.error(f"Failed to back up container data for: {container_name}")
-                success = False
+                return False
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error backing up container data for {container_name}: {str(e)}")
+            return False
+        finally:
+            # Replace the estimate with what was actually written
+            try:
+                actual_size = os.path.getsize(output_path)
+            except OSError:
+                actual_size = 0
+            self._release_disk_space(reserved - actual_size)
+    
+    def _reserve_disk_space(self, size: int, container_name: str) -> int:
+        """
+        Reserve space against the budget computed by _check_disk_space.
         
-        return success
+        Waits while other workers hold the space needed. A size larger than
+        the whole budget is capped to the budget, so such backups run one at
+        a time instead of failing. Once no other reservation is outstanding
+        the reservation is granted regardless, as nothing would free space.
+        
+        Args:
+            size (int): Number of bytes to reserve.
+            container_name (str): Container name, for logging.
+            
+        Returns:
+            int: Number of bytes reserved; pass it back to _release_disk_space.
+        """
+        with self._disk_cond:
+            size = min(size, max(self._disk_budget, 0))
+            if self._available_bytes < size and self._disk_reservations:
+                logger.debug(f"Waiting for disk space to back up container data for: {container_name}")
+            self._disk_cond.wait_for(
+                lambda: self._available_bytes >= size or not self._disk_reservations)
+            self._available_bytes -= size
+            self._disk_reservations += 1
+            return size
+    
+    def _release_disk_space(self, size: int) -> None:
+        """
+        Return unused bytes to the disk space budget and wake waiting workers.
+        
+        Args:
+            size (int): Number of bytes to release.
+        """
+        with self._disk_cond:
+            self._available_bytes += size
+            self._disk_reservations -= 1
+            self._disk_cond.notify_all()
     
     def _check_disk_space(self) -> bool:
         """
         Check if there's enough disk space for container backup.
         
+        Also records the space above the required minimum in
+        ``_available_bytes`` as the budget for per-container reservations.
+        
         Returns:
             bool: True if enough space, False otherwise.
         """
@@ -309,6 +758,10 @@ class ServiceBackup:
             logger.debug(f"Available space: {available_space / (1024*1024):.2f} MB, " +
                          f"Required: {required_space / (1024*1024):.2f} MB")
             
+            with self._disk_cond:
+                self._disk_budget = available_space - required_space
+                self._available_bytes = self._disk_budget
+            
             return available_space > required_space
         except Exception as e:
             logger.error(f"Error checking disk space: {str(e)}")
@@ -321,30 +774,15 @@ class ServiceBackup:
         Returns:
             list: List of database container objects.
         """
-        db_containers = []
-        db_patterns = self.db_config.get('container_patterns', [])
+        # Snapshot the attributes checked once per container; the result is memoized
+        snapshot = tuple((container.id, self._container_image(container), container.name)
+                         for container in self.containers)
+        db_ids = _classify_db_containers(
+            snapshot, tuple(self.db_config.get('container_patterns') or ()))
         
+        db_containers = []
         for container in self.containers:
-            # Check if container looks like a database
-            is_db = False
-            
-            # First check by image name
-            if hasattr(container, 'image') and container.image.tags:
-                image_name = container.image.tags[0].lower()
-                is_db = any(db_type in image_name for db_type in 
-                           ["postgres", "mysql", "mariadb", "mongo", "redis", "sqlite"])
-            
-            # Then check against configured patterns
-            if not is_db and db_patterns:
-                container_name = container.name.lower()
-                for pattern in db_patterns:
-                    # Convert wildcard pattern to Python compatible
-                    py_pattern = pattern.replace('*', '').lower()
-                    if py_pattern in container_name:
-                        is_db = True
-                        break
-            
-            if is_db:
+            if container.id in db_ids:
                 db_containers.append(container)
                 logger.debug(f"Identified database container: {container.name}")
         
@@ -361,7 +799,7 @@ class ServiceBackup:
         app_containers = []
         
         for container in self.containers:
-            if container not in self.db_containers:
+            if container.id not in self._db_container_ids:
                 app_containers.append(container)
                 logger.debug(f"Identified application container: {container.name}")
         
@@ -371,6 +809,10 @@ class ServiceBackup:
         """
         Stop containers for consistent backup with improved exclusion handling.
         
+        Containers are stopped concurrently in tiers: application containers
+        first, then database containers, so dependents go down before the
+        services they rely on.
+        
         Returns:
             list: List of stopped container objects.
         """
@@ -378,17 +820,16 @@ class ServiceBackup:
         stopped_containers = []
         
         try:
-            # Get current backup container identifiers
-            current_identifiers = self._get_current_container_identifiers()
-            logger.debug(f"Current container identifiers: {current_identifiers}")
+            logger.debug(f"Current container identifiers: {self._get_current_container_identifiers()}")
             
-            # Get stack name if available
-            stack_name = self._get_stack_name()
+            # Fetch fresh statuses in one call; the listing the containers came from may be stale
+            statuses = get_container_statuses([container.id for container in self.containers])
             
-            # Stop containers in reverse order (dependencies first)
-            for container in reversed(self.containers):
+            # Select containers to stop
+            to_stop = []
+            for container in self.containers:
                 # Skip current container
-                if self._is_current_container(container, current_identifiers):
+                if self._is_current_container(container):
                     logger.info(f"Skipping current container: {container.name}")
                     continue
                 
@@ -398,18 +839,21 @@ class ServiceBackup:
                     logger.info(f"Container {container.name} supports hot backup, not stopping")
                     continue
                 
-                # Stop the container
-                if hasattr(container, 'status') and container.status == "running":
-                    logger.info(f"Stopping container: {container.name}")
-                    try:
-                        container.stop(timeout=30)  # Give containers 30 seconds to stop
-                        stopped_containers.append(container)
-                    except Exception as e:
-                        logger.error(f"Error stopping container {container.name}: {str(e)}")
-            
-            # Short delay to ensure containers are fully stopped
-            if stopped_containers:
-                time.sleep(2)
+                status = (statuses.get(container.id) if statuses is not None
+                          else self._container_status(container))
+                if status == "running":
+                    to_stop.append(container)
+            
+            # Stop dependents before their dependencies, each tier concurrently
+            for tier in reversed(self._lifecycle_tiers(to_stop)):
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_LIFECYCLE_WORKERS, len(tier))) as executor:
+                    future_to_container = {
+                        executor.submit(self._stop_container, container): container
+                        for container in tier
+                    }
+                    for future in concurrent.futures.as_completed(future_to_container):
+                        if future.result():
+                            stopped_containers.append(future_to_container[future])
             
             return stopped_containers
                 
@@ -419,6 +863,122 @@ class ServiceBackup:
             self._start_containers(stopped_containers)
             return []
     
+    def _stop_container(self, container: Any) -> bool:
+        """
+        Stop a single container.
+        
+        Args:
+            container: Container object to stop.
+            
+        Returns:
+            bool: True if the container was stopped, False otherwise.
+        """
+        logger.info(f"Stopping container: {container.name}")
+        try:
+            container.stop(timeout=30)  # Give containers 30 seconds to stop
+        except Exception as e:
+            logger.error(f"Error stopping container {container.name}: {str(e)}")
+            return False
+        
+        # Return as soon as the engine reports the container down
+        try:
+            container.wait(condition="not-running", timeout=5)
+        except Exception as e:
+            logger.debug(f"Gave up waiting for {container.name} to stop: {str(e)}")
+        return True
+    
+    @functools.cached_property
+    def _dependency_graph(self) -> Dict[str, Set[str]]:
+        """
+        Map each container id to the ids of the containers it depends on.
+        
+        Dependencies come from the compose ``depends_on`` label and legacy
+        links. When neither is present, application containers are taken to
+        depend on the service's database containers.
+        
+        Returns:
+            dict: Container id to set of dependency container ids.
+        """
+        ids_by_name: Dict[str, Set[str]] = collections.defaultdict(set)
+        for container in self.containers:
+            ids_by_name[container.name].add(container.id)
+            compose_service = self._container_labels(container).get('com.docker.compose.service')
+            if compose_service:
+                ids_by_name[compose_service].add(container.id)
+        
+        graph: Dict[str, Set[str]] = collections.defaultdict(set)
+        for container in self.containers:
+            # Label format: "db:service_started:false,cache:service_healthy:true"
+            depends_on = self._container_labels(container).get('com.docker.compose.depends_on', '')
+            names = [entry.split(':', 1)[0] for entry in depends_on.split(',') if entry]
+            # Link format: "/db:/app/db"
+            links = (self._inspect(container).get('HostConfig') or {}).get('Links') or []
+            names.extend(link.split(':', 1)[0].lstrip('/') for link in links)
+            
+            for name in names:
+                graph[container.id].update(ids_by_name.get(name, ()))
+            graph[container.id].discard(container.id)
+        
+        if not any(graph.values()):
+            for container in self.app_containers:
+                graph[container.id].update(self._db_container_ids)
+        
+        return graph
+    
+    def _dependency_tiers(self, containers: List[Any]) -> List[List[Any]]:
+        """
+        Split containers into tiers using Kahn's algorithm.
+        
+        Every container's dependencies are in an earlier tier, so tiers can be
+        started in order (or stopped in reverse), each one concurrently.
+        
+        Args:
+            containers (list): Container objects to order.
+            
+        Returns:
+            list: Non-empty tiers of container objects.
+        """
+        by_id = {c.id: c for c in containers}
+        pending = {
+            container_id: self._dependency_graph.get(container_id, set()) & by_id.keys()
+            for container_id in by_id
+        }
+        
+        tiers = []
+        while pending:
+            ready = [container_id for container_id, deps in pending.items() if not deps]
+            if not ready:
+                logger.warning(f"Dependency cycle in service {self.service_name}, "
+                               f"handling {len(pending)} containers together")
+                ready = list(pending)
+            
+            tiers.append([by_id[container_id] for container_id in ready])
+            for container_id in ready:
+                del pending[container_id]
+            for deps in pending.values():
+                deps.difference_update(ready)
+        
+        return tiers
+    
+    def _lifecycle_tiers(self, containers: List[Any]) -> List[List[Any]]:
+        """
+        Group containers for stopping and starting.
+        
+        By default each dependency tier is handled concurrently. Setting
+        global.parallel_stop to false puts every container in its own tier,
+        so they are stopped and started one at a time in dependency order.
+        
+        Args:
+            containers (list): Container objects to group.
+            
+        Returns:
+            list: Non-empty groups of container objects, dependencies first.
+        """
+        tiers = self._dependency_tiers(containers)
+        if self.global_config.get('parallel_stop', True):
+            return tiers
+        return [[container] for tier in tiers for container in tier]
+    
     def _check_hot_backup_support(self, container) -> bool:
         """
         Check if a container supports hot backup.
@@ -430,11 +990,11 @@ class ServiceBackup:
             bool: True if hot backup is supported, False otherwise
         """
         # Default to cold backup
-        if not hasattr(container, 'name') or not hasattr(container, 'labels'):
+        if not hasattr(container, 'name'):
             return False
         
         # Check container labels
-        labels = container.labels if isinstance(container.labels, dict) else {}
+        labels = self._container_labels(container)
         
         # Check for explicit hot backup label
         if labels.get('backup.hot', '').lower() == 'true':
@@ -442,12 +1002,11 @@ class ServiceBackup:
         
         # Check for container type that typically supports hot backup
         image = labels.get('org.opencontainers.image.name', '')
-        if not image and hasattr(container, 'image'):
-            image = str(container.image)
+        if not image:
+            image = self._container_image(container)
         
         # Database containers often support hot backup
-        db_types = ['postgres', 'mysql', 'mariadb', 'mongodb', 'redis']
-        if any(db_type in image.lower() for db_type in db_types):
+        if _HOT_BACKUP_IMAGE_RE.search(image):
             return True
         
         # Default to cold backup
@@ -458,6 +1017,9 @@ class ServiceBackup:
         Start containers after backup with validation and health checking.
         Enhanced with better error handling and retry logic.
         
+        Dependencies are started before the containers that need them;
+        containers within a tier are started and health-checked concurrently.
+        
         Args:
             containers (list): List of container objects to start.
         """
@@ -470,65 +1032,25 @@ class ServiceBackup:
         started_containers = []
         failed_containers = []
         
-        # Start containers in reverse order (dependencies last)
+        named_containers = []
         for container in containers:
-            try:
-                if not hasattr(container, 'name'):
-                    logger.warning(f"Container object missing name attribute, skipping")
-                    continue
-                    
-                logger.info(f"Starting container: {container.name}")
-                container.start()
-                
-                # Verify container started successfully
-                start_time = time.time()
-                max_wait = 60  # Increased timeout for slower services
-                
-                while time.time() - start_time < max_wait:
-                    # Refresh container status
-                    try:
-                        container.reload()
-                        if container.status == "running":
-                            # Check for health status if available
-                            health = getattr(container, 'health', {})
-                            if health and isinstance(health, dict):
-                                health_status = health.get('Status', '')
-                                if health_status == 'unhealthy':
-                                    logger.warning(f"Container {container.name} is running but unhealthy")
-                                    time.sleep(2)
-                                    continue
-                                
-                            # Container is running (and healthy if health check exists)
-                            started_containers.append(container)
-                            logger.info(f"Container {container.name} started successfully")
-                            break
-                    except Exception as e:
-                        logger.warning(f"Error checking container status: {str(e)}")
-                    
-                    # Wait a bit before checking again
-                    time.sleep(2)
-                
-                # If container didn't start within timeout
-                if container not in started_containers:
-                    logger.error(f"Container {container.name} failed to start within {max_wait} seconds")
-                    # Try another restart with increased timeout
-                    try:
-                        logger.info(f"Attempting another restart for {container.name}")
-                        container.restart(timeout=60)
-                        time.sleep(5)
-                        container.reload()
-                        if container.status == "running":
-                            started_containers.append(container)
-                            logger.info(f"Container {container.name} started successfully on second attempt")
-                        else:
-                            failed_containers.append(container)
-                    except Exception as e:
-                        logger.error(f"Error restarting container {container.name}: {str(e)}")
+            if not hasattr(container, 'name'):
+                logger.warning(f"Container object missing name attribute, skipping")
+                continue
+            named_containers.append(container)
+        
+        for tier in self._lifecycle_tiers(named_containers):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_LIFECYCLE_WORKERS, len(tier))) as executor:
+                future_to_container = {
+                    executor.submit(self._start_container, container): container
+                    for container in tier
+                }
+                for future in concurrent.futures.as_completed(future_to_container):
+                    container = future_to_container[future]
+                    if future.result():
+                        started_containers.append(container)
+                    else:
                         failed_containers.append(container)
-                    
-            except Exception as e:
-                logger.error(f"Error starting container {container.name}: {str(e)}")
-                failed_containers.append(container)
         
         # Log summary
         if started_containers:
@@ -538,6 +1060,140 @@ class ServiceBackup:
             names = [c.name for c in failed_containers if hasattr(c, 'name')]
             logger.error(f"Failed to start {len(failed_containers)} containers: {', '.join(names)}")
     
+    def _start_container(self, container: Any) -> bool:
+        """
+        Start a single container and wait for it to be running (and healthy).
+        
+        Args:
+            container: Container object to start.
+            
+        Returns:
+            bool: True if the container is running, False otherwise.
+        """
+        try:
+            logger.info(f"Starting container: {container.name}")
+            since = int(time.time())
+            container.start()
+            
+            max_wait = 60  # Increased timeout for slower services
+            deadline = time.monotonic() + max_wait
+            
+            # Docker pushes state and health transitions, so wait on those
+            # rather than polling; fall back to polling if events are unavailable
+            started = self._wait_for_container_events(container, since, max_wait)
+            if started is None:
+                started = self._poll_container_running(container, deadline)
+            if started:
+                logger.info(f"Container {container.name} started successfully")
+                return True
+            
+            # Container didn't start within timeout
+            logger.error(f"Container {container.name} failed to start within {max_wait} seconds")
+            # Try another restart with increased timeout
+            try:
+                logger.info(f"Attempting another restart for {container.name}")
+                container.restart(timeout=60)
+                time.sleep(5)
+                container.reload()
+                if container.status == "running":
+                    logger.info(f"Container {container.name} started successfully on second attempt")
+                    return True
+                return False
+            except Exception as e:
+                logger.error(f"Error restarting container {container.name}: {str(e)}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Error starting container {container.name}: {str(e)}")
+            return False
+    
+    def _container_is_up(self, container: Any) -> bool:
+        """
+        Refresh a container and check it is running and not unhealthy.
+        
+        Args:
+            container: Container object.
+            
+        Returns:
+            bool: True if the container is running (and healthy if checked).
+        """
+        container.reload()
+        if container.status != "running":
+            return False
+        
+        # Check for health status if available
+        health = getattr(container, 'health', {})
+        if health and isinstance(health, dict) and health.get('Status', '') == 'unhealthy':
+            logger.warning(f"Container {container.name} is running but unhealthy")
+            return False
+        return True
+    
+    def _wait_for_container_events(self, container: Any, since: int,
+                                   max_wait: float) -> Optional[bool]:
+        """
+        Wait for a started container to come up using the Docker events stream.
+        
+        Args:
+            container: Container object that was just started.
+            since (int): Unix time before the start request, so no event is missed.
+            max_wait (float): Seconds to wait before giving up.
+            
+        Returns:
+            bool or None: Whether the container came up, or None if the events
+            API could not be used.
+        """
+        try:
+            if self._container_is_up(container):
+                return True
+            
+            events = container.client.events(
+                since=since, until=int(time.time() + max_wait) + 1, decode=True,
+                filters={'container': container.id, 'event': ['start', 'health_status', 'die']})
+        except Exception as e:
+            logger.debug(f"Docker events unavailable for {container.name}: {str(e)}")
+            return None
+        
+        try:
+            # The stream ends by itself at the deadline
+            for _ in events:
+                if self._container_is_up(container):
+                    return True
+            return self._container_is_up(container)
+        except Exception as e:
+            logger.warning(f"Error waiting for container {container.name}: {str(e)}")
+            return None
+        finally:
+            close = getattr(events, 'close', None)
+            if close:
+                close()
+    
+    def _poll_container_running(self, container: Any, deadline: float) -> bool:
+        """
+        Poll a started container until it is up, with exponential backoff.
+        
+        Polling starts at 50 ms so fast starters are confirmed almost
+        immediately, and backs off to one check per second for slow ones.
+        
+        Args:
+            container: Container object that was just started.
+            deadline (float): time.monotonic() value to give up at.
+            
+        Returns:
+            bool: True if the container came up before the deadline.
+        """
+        delay = 0.05
+        while time.monotonic() < deadline:
+            try:
+                if self._container_is_up(container):
+                    return True
+            except Exception as e:
+                logger.warning(f"Error checking container status: {str(e)}")
+            
+            # Wait a bit before checking again
+            time.sleep(delay)
+            delay = min(delay * 1.7, 1.0)
+        return False
+    
     def _container_needs_stopping(self, container):
         """
         Determine if a container needs to be stopped for backup.
@@ -555,18 +1211,16 @@ class ServiceBackup:
         container_name = container.name.lower()
         
         # Skip containers based on labels or service information if possible
-        if hasattr(container, 'labels'):
-            labels = container.labels if isinstance(container.labels, dict) else {}
-            
+        labels = self._container_labels(container)
+        if labels:
             # Check for "hot backup" label
             if labels.get('container-backup.hot', '').lower() == 'true':
                 logger.debug(f"Container {container_name} marked for hot backup via label")
                 return False
                 
             # Check database containers - many support hot backup
-            db_images = ['postgres', 'mysql', 'mariadb', 'mongo', 'redis']
             image_name = labels.get('org.opencontainers.image.name', '')
-            if any(db in image_name.lower() for db in db_images):
+            if _HOT_BACKUP_LABEL_IMAGE_RE.search(image_name):
                 logger.debug(f"Container {container_name} identified as database, using hot backup")
                 return False
         
@@ -580,40 +1234,14 @@ class ServiceBackup:
         Returns:
             dict: Dictionary with hostname, container ID, and name.
         """
-        identifiers = {}
-        
-        # Get hostname
-        try:
-            import socket
-            identifiers['hostname'] = socket.gethostname()
-        except Exception as e:
-            logger.debug(f"Could not determine hostname: {str(e)}")
-        
-        # Get container ID
-        try:
-            with open('/proc/self/cgroup', 'r') as f:
-                for line in f:
-                    if 'docker' in line:
-                        identifiers['container_id'] = line.split('/')[-1].strip()
-                        break
-        except Exception as e:
-            logger.debug(f"Could not determine container ID: {str(e)}")
-        
-        # Get environment variables that might indicate container name
-        try:
-            identifiers['container_name'] = os.environ.get('HOSTNAME', '')
-        except Exception:
-            pass
-            
-        return identifiers
+        return _current_container_identifiers()
 
-    def _is_current_container(self, container: Any, current_identifiers: Dict[str, str]) -> bool:
+    def _is_current_container(self, container: Any) -> bool:
         """
         Check if a container is the current container.
         
         Args:
             container: Container object to check.
-            current_identifiers: Dictionary of current container identifiers.
             
         Returns:
             bool: True if this is the current container, False otherwise.
@@ -623,29 +1251,14 @@ class ServiceBackup:
             return False
         
         # Check by container ID (most reliable)
-        if 'container_id' in current_identifiers and current_identifiers['container_id']:
-            if container.id == current_identifiers['container_id']:
-                return True
-        
-        # Check by hostname
-        if 'hostname' in current_identifiers and current_identifiers['hostname']:
-            if container.name == current_identifiers['hostname']:
-                return True
-            
-        # Check by environment variable name
-        if 'container_name' in current_identifiers and current_identifiers['container_name']:
-            if container.name == current_identifiers['container_name']:
-                return True
-        
-        # Check by service name
-        backup_service_names = os.environ.get('BACKUP_SERVICE_NAMES', 'container-backup,backup')
-        backup_names = [name.strip() for name in backup_service_names.split(',')]
-        
-        for name in backup_names:
-            if container.name == name or container.name.startswith(f"{name}_"):
-                return True
+        if self._self_id and container.id == self._self_id:
+            return True
+        if self._self_short_id and container.id.startswith(self._self_short_id):
+            return True
         
-        return False
+        # Check by hostname, HOSTNAME and backup service names
+        name = container.name
+        return name in self._self_names or name.startswith(self._self_name_prefixes)
 
     def _backup_databases(self, backup_dir: str) -> bool:
         """
@@ -662,44 +1275,87 @@ class ServiceBackup:
             return False
         
         os.makedirs(backup_dir, exist_ok=True)
-        success_count = 0
         
+        self._db_members = []
+        
+        # Loop invariants
+        db_type = self.db_config.get('type')
+        configured_credentials = self.db_config.get('credentials')
+        path_prefix = os.path.normpath(backup_dir) + os.sep
+        
+        # Prepare handlers and credentials serially; environment parsing is cheap
+        tasks = []
         for container in self.db_containers:
             try:
-                logger.info(f"Backing up database in container: {container.name}")
-                
-                # Get environment variables for credential extraction
-                env_vars = get_container_environment(container)
-                
                 # Set up database backup handler
                 db_backup = DatabaseBackup(
                     container=container,
-                    db_type=self.db_config.get('type'),
+                    db_type=db_type,
                     config=self.db_config
                 )
                 
                 # Extract credentials
-                if self.db_config.get('credentials'):
+                if configured_credentials:
                     # Use configured credentials
-                    credentials = self.db_config.get('credentials')
+                    credentials = configured_credentials
                 else:
                     # Extract credentials from environment
+                    env_vars = get_container_environment(container)
                     credentials = db_backup.get_credentials_from_environment(
                         env_vars, self.service_name)
                 
                 # Set credentials
                 db_backup.credentials = credentials
+                db_backup.in_memory = self.streaming_archive
                 
-                # Execute backup
-                backup_path = os.path.join(backup_dir, f"{container.name}.sql.gz")
-                if db_backup.backup(backup_path):
-                    success_count += 1
+                backup_path = f"{path_prefix}{container.name}.sql.gz"
+                tasks.append((container, db_backup, backup_path))
                 
             except Exception as e:
-                logger.error(f"Error backing up database container {container.name}: {str(e)}")
+                logger.error(f"Error preparing database backup for {container.name}: {str(e)}")
+        
+        if not tasks:
+            return False
+        
+        # Run the dumps concurrently, bounded by DB_BACKUP_PARALLELISM
+        parallelism = max(1, int(os.environ.get('DB_BACKUP_PARALLELISM', '4')))
+        success_count = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(parallelism, len(tasks))) as executor:
+            futures = [
+                executor.submit(self._backup_single_database, container, db_backup, backup_path)
+                for container, db_backup, backup_path in tasks
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                if future.result():
+                    success_count += 1
         
         return success_count > 0
     
+    def _backup_single_database(self, container: Any, db_backup: DatabaseBackup,
+                                backup_path: str) -> bool:
+        """
+        Dump a single database container.
+        
+        Args:
+            container: Database container object.
+            db_backup (DatabaseBackup): Configured backup handler.
+            backup_path (str): Path of the dump file to create.
+            
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            logger.info(f"Backing up database in container: {container.name}")
+            if not db_backup.backup(backup_path):
+                return False
+            
+            if db_backup.dump_file is not None:
+                self._db_members.append((os.path.basename(backup_path), db_backup.dump_file))
+            return True
+        except Exception as e:
+            logger.error(f"Error backing up database container {container.name}: {str(e)}")
+            return False
+    
     def _backup_app_data(self, backup_dir: str) -> bool:
         """
         Back up all application data in service.
@@ -715,66 +1371,93 @@ class ServiceBackup:
             return False
         
         os.makedirs(backup_dir, exist_ok=True)
-        success_count = 0
         
-        # Get configured paths and exclusions
-        paths = self.files_config.get('data_paths', [])
-        exclusions = self.files_config.get('exclusions', [])
+        # Back up app containers concurrently
+        max_workers = min(self.backup_parallelism, len(self.app_containers))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda container: self._backup_single_app_container(container, backup_dir),
+                self.app_containers))
         
-        for container in self.app_containers:
-            try:
-                logger.info(f"Backing up data in container: {container.name}")
-                
-                # Set up file backup handler
-                file_backup = FileBackup(
-                    container=container,
-                    paths=paths,
-                    exclusions=exclusions
-                )
-                
-                # Execute backup
-                backup_path = os.path.join(backup_dir, f"{container.name}.tar.gz")
-                if file_backup.backup(backup_path):
-                    success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error backing up application container {container.name}: {str(e)}")
+        return any(results)
+    
+    def _backup_single_app_container(self, container: Any, backup_dir: str) -> bool:
+        """
+        Back up the configured data paths of a single application container.
         
-        return success_count > 0
+        Args:
+            container: Container object.
+            backup_dir (str): Directory to store backups.
+            
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            logger.info(f"Backing up data in container: {container.name}")
+            
+            # Set up file backup handler
+            file_backup = FileBackup(
+                container=container,
+                paths=self.files_config.get('data_paths', []),
+                exclusions=self._app_exclusions,
+                exclusion_re=self._app_exclusion_re
+            )
+            
+            # Execute backup
+            backup_path = os.path.join(backup_dir, f"{container.name}.tar.gz")
+            return file_backup.backup(backup_path)
+            
+        except Exception as e:
+            logger.error(f"Error backing up application container {container.name}: {str(e)}")
+            return False
     
-    def _create_archive(self, backup_dir: str, timestamp: str) -> Optional[str]:
+    def _create_archive(self, backup_dir: str, timestamp: str,
+                        now: Optional[datetime] = None) -> Optional[str]:
         """
         Create final archive of service backup.
         
         Args:
             backup_dir (str): Directory containing backups.
             timestamp (str): Timestamp for archive name.
+            now (datetime, optional): Backup start time the timestamp was derived from.
             
         Returns:
             str or None: Path to created archive, or None if failed.
         """
-        archive_path = os.path.join("/backups", f"{self.service_name}_{timestamp}.tar.gz")
-        
         try:
-            # Check if backup_dir is empty
-            if not os.listdir(backup_dir):
+            # Stream staged files and bind mounts into the archive in one pass
+            path_prefix = os.path.normpath(backup_dir) + os.sep
+            entries = [(f"{path_prefix}{name}", name) for name in sorted(os.listdir(backup_dir))]
+            entries.extend(self._mount_entries)
+            
+            # Check if there is anything to archive
+            members = list(self._db_members)
+            metadata = self._build_metadata(timestamp, now)
+            if not entries and not members:
                 logger.warning(f"No files to archive in {backup_dir}")
                 # Create a minimal archive with just metadata
-                metadata = {
-                    "service_name": self.service_name,
-                    "timestamp": timestamp,
-                    "created_at": datetime.now().isoformat(),
-                    "warning": "No files were backed up for this service",
-                    "containers": [c.name for c in self.containers if hasattr(c, 'name')]
-                }
-                
-                # Write metadata to file
-                metadata_path = os.path.join(backup_dir, "metadata.json")
-                with open(metadata_path, 'w') as f:
-                    json.dump(metadata, f, indent=2)
+                metadata["warning"] = "No files were backed up for this service"
+            
+            # Metadata is a small member; it does not decide the outer compression
+            compressor = self._select_compressor(
+                [arcname for _, arcname in entries] + [arcname for arcname, _ in members])
+            members.extend(_metadata_members(metadata))
+            extension, create_archive, level_variable, default_level = _ARCHIVE_FORMATS[compressor]
+            archive_path = os.path.join("/backups", f"{self.service_name}_{timestamp}.{extension}")
+            exclusions = self.files_config.get('exclusions', [])
+            compression_level = int(
+                (level_variable and os.environ.get(level_variable))
+                or os.environ.get('BACKUP_COMPRESSION_LEVEL', default_level))
             
-            # Create the archive
-            if create_tar_gz(backup_dir, archive_path):
+            # Stream straight to remote storage when configured, keeping local disk as fallback
+            upload_command = self._upload_command(os.path.basename(archive_path))
+            if upload_command:
+                if create_archive(entries, archive_path, exclusions, compression_level, members,
+                                  upload_command=upload_command):
+                    return os.path.basename(archive_path)
+                logger.warning(f"Upload of {self.service_name} archive failed, writing it locally")
+            
+            if create_archive(entries, archive_path, exclusions, compression_level, members):
                 logger.info(f"Created backup archive: {archive_path}")
                 
                 # Log the size for debugging
@@ -796,49 +1479,92 @@ class ServiceBackup:
             logger.error(f"Error creating backup archive: {str(e)}")
             return None
     
-    def _create_metadata(self, backup_dir: str, timestamp: str) -> bool:
+    def _upload_command(self, filename: str) -> Optional[List[str]]:
         """
-        Create metadata file for backup.
+        Build the command the archive is streamed to, if a remote destination is set.
+        
+        The destination comes from global.destination.command (a list) or the
+        BACKUP_UPLOAD_COMMAND environment variable (a shell-style string). The
+        command reads the archive on stdin; "{filename}" in any argument is
+        replaced with the archive file name.
+        
+        Args:
+            filename (str): Archive file name.
+            
+        Returns:
+            list or None: Upload command, or None to write the archive locally.
+        """
+        destination = self.global_config.get('destination') or {}
+        command = destination.get('command') or os.environ.get('BACKUP_UPLOAD_COMMAND', '')
+        if isinstance(command, str):
+            command = shlex.split(command)
+        if not command:
+            return None
+        
+        return [arg.replace('{filename}', filename) for arg in command]
+    
+    def _select_compressor(self, arcnames: List[str]) -> str:
+        """
+        Choose how the final archive is compressed.
+        
+        Multithreaded zstd is the default when installed, otherwise gzip (via
+        pigz when installed). When every member is an already-compressed dump
+        or archive, the outer archive is stored uncompressed instead of
+        compressing twice.
+        
+        Args:
+            arcnames (list): Names of the top-level archive members.
+            
+        Returns:
+            str: One of 'gzip', 'zstd' or 'none'.
+        """
+        compressor = str(self.global_config.get(
+            'compressor', os.environ.get('BACKUP_COMPRESSOR', DEFAULT_COMPRESSOR))).lower()
+        if compressor not in _ARCHIVE_FORMATS:
+            logger.warning(f"Unknown compressor '{compressor}', using {DEFAULT_COMPRESSOR}")
+            compressor = DEFAULT_COMPRESSOR
+        if compressor == 'zstd' and not ZSTD_PATH:
+            logger.warning("zstd compression requested but zstd is not installed, using gzip")
+            compressor = 'gzip'
+        
+        if (compressor != 'none' and arcnames and not self._mount_entries
+                and all(arcname.endswith(PRECOMPRESSED_SUFFIXES) for arcname in arcnames)):
+            logger.info("All archive members are already compressed, storing them as-is")
+            compressor = 'none'
+        
+        return compressor
+    
+    def _build_metadata(self, timestamp: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Build the metadata stored in the backup archive.
+        
+        Credentials in the service configuration are masked.
         
         Args:
-            backup_dir (str): Directory to store metadata.
             timestamp (str): Backup timestamp.
+            now (datetime, optional): Backup start time the timestamp was derived from.
             
         Returns:
-            bool: True if successful, False otherwise.
+            dict: Backup metadata.
         """
-        metadata = {
+        db_ids = self._db_container_ids
+        return {
             "service_name": self.service_name,
             "timestamp": timestamp,
-            "created_at": datetime.now().isoformat(),
-            "containers": [],
-            "config": {
+            "created_at": (now or datetime.now()).isoformat(),
+            "containers": [
+                {
+                    "name": name,
+                    "id": container_id,
+                    "image": image,
+                    "status": status,
+                    "type": "database" if container_id in db_ids else "application"
+                }
+                for name, container_id, image, status in self._container_snapshots
+            ],
+            "config": mask_sensitive_data({
                 "database": self.db_config,
                 "files": self.files_config,
                 "global": self.global_config
-            }
+            })
         }
-        
-        # Add container information
-        for container in self.containers:
-            container_info = {
-                "name": container.name,
-                "id": container.id,
-                "image": container.image.tags[0] if container.image.tags else "unknown",
-                "status": container.status,
-                "type": "database" if container in self.db_containers else "application"
-            }
-            metadata["containers"].append(container_info)
-        
-        try:
-            # Write metadata to file
-            metadata_path = os.path.join(backup_dir, "metadata.json")
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            logger.debug(f"Created backup metadata at {metadata_path}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error creating backup metadata: {str(e)}")
-            return False
@@ -7,13 +7,18 @@ Discovers and categorizes Docker services for backup.
 """
 
 import os
-from typing import Dict, List, Any, Optional
+import sys
+import concurrent.futures
+from typing import Dict, List, Any, Optional, Tuple
 from logger import get_logger
 from service_backup import ServiceBackup
-from utils.docker_utils import get_running_containers
+from utils.docker_utils import get_containers_by_ids, get_running_container_summaries
 
 logger = get_logger(__name__)
 
+# Labels naming a container's stack, in order of precedence
+_SERVICE_LABEL_KEYS = ('com.docker.compose.project', 'io.docker.compose.project', 'io.portainer.stackname')
+
 class ServiceDiscovery:
     """Discovers and categorizes Docker services for backup."""
     
@@ -29,43 +34,65 @@ class ServiceDiscovery:
         self.config_manager = config_manager
         logger.debug("Initialized service discovery")
     
-    def discover_services(self) -> List[ServiceBackup]:
+    def discover_services(self, temp_root: Optional[str] = None) -> List[ServiceBackup]:
         """
         Discover all services and their components.
         
+        Args:
+            temp_root (str, optional): Shared scratch directory handed to each
+                                       ServiceBackup for its working files.
+            
         Returns:
             list: List of ServiceBackup objects.
         """
         logger.info("Discovering services")
         
-        # Get all running containers
-        containers = get_running_containers()
-        if not containers:
+        # Docker and Portainer are independent round trips, so fetch them together
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            summaries_future = executor.submit(get_running_container_summaries)
+            stacks_future = executor.submit(self.portainer_client.get_stacks)
+            summaries = summaries_future.result()
+            stacks = stacks_future.result()
+        
+        if not summaries:
             logger.warning("No running containers found")
             return []
         
-        logger.info(f"Found {len(containers)} running containers")
+        logger.info(f"Found {len(summaries)} running containers")
         
-        # Get stacks from Portainer
-        stacks = self.portainer_client.get_stacks()
+        # Group container summaries by service/stack; names and labels are enough
+        services = self._group_by_service(summaries, stacks)
         
-        # Group containers by service/stack
-        services = self._group_by_service(containers, stacks)
+        # Skip services excluded by environment before inspecting their containers
+        excluded_services = self._build_exclusion_set()
+        for service_name in [name for name in services if name.lower() in excluded_services]:
+            logger.info(f"Skipping excluded service: {service_name}")
+            del services[service_name]
+        
+        # Inspect the remaining containers in one batch
+        containers_by_id = {container.id: container for container in get_containers_by_ids(
+            [summary['Id'] for group in services.values() for summary in group])}
         
         # Create ServiceBackup objects
         service_backups = []
         
-        for service_name, service_containers in services.items():
-            # Skip excluded services
-            if self._is_excluded(service_name):
-                logger.info(f"Skipping excluded service: {service_name}")
+        for service_name, service_summaries in services.items():
+            # Containers removed since they were listed are dropped
+            service_containers = [containers_by_id[summary['Id']] for summary in service_summaries
+                                  if summary['Id'] in containers_by_id]
+            if not service_containers:
+                logger.warning(f"No containers left to back up for service: {service_name}")
                 continue
             
-            # Get service configuration
+            # Get service configuration, used for both the exclusion flag and the backup
             config = self.config_manager.get_service_config(service_name, service_containers)
+            if config.get('global', {}).get('exclude_from_backup', False):
+                logger.info(f"Skipping excluded service: {service_name}")
+                continue
             
             # Create ServiceBackup object
-            service_backup = ServiceBackup(service_name, service_containers, config)
+            service_backup = ServiceBackup(service_name, service_containers, config,
+                                           temp_root=temp_root)
             service_backups.append(service_backup)
             
             logger.debug(f"Discovered service: {service_name} with {len(service_containers)} containers")
@@ -73,101 +100,94 @@ class ServiceDiscovery:
         logger.info(f"Discovered {len(service_backups)} services for backup")
         return service_backups
     
-    def _group_by_service(self, containers: List[Any], stacks: Dict[str, str]) -> Dict[str, List[Any]]:
+    def _group_by_service(self, summaries: List[Dict[str, Any]],
+                          stacks: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Group containers by service/stack.
+        Group container summaries by service/stack.
         
         Args:
-            containers (list): List of container objects.
+            summaries (list): Container summaries from the Docker list API.
             stacks (dict): Dictionary of stack names to stack IDs.
             
         Returns:
-            dict: Dictionary of service names to container lists.
+            dict: Dictionary of service names to summary lists.
         """
         services = {}
+        stack_prefixes = self._build_stack_prefixes(stacks)
         
-        for container in containers:
-            service_name = self._get_service_name(container, stacks)
-            
-            if service_name not in services:
-                services[service_name] = []
-            
-            services[service_name].append(container)
+        for summary in summaries:
+            service_name = self._get_service_name(summary, stacks, stack_prefixes)
+            services.setdefault(service_name, []).append(summary)
         
         return services
     
-    def _get_service_name(self, container: Any, stacks: Dict[str, str]) -> str:
+    def _build_stack_prefixes(self, stacks: Dict[str, str]) -> Dict[str, Tuple[int, str]]:
+        """
+        Map each stack's container-name prefix to its position and name.
+        
+        Args:
+            stacks (dict): Dictionary of stack names to stack IDs.
+            
+        Returns:
+            dict: "<stack>_" prefix to (position in stacks, stack name).
+        """
+        prefixes = {}
+        for position, stack_name in enumerate(stacks):
+            prefixes.setdefault(f"{stack_name}_", (position, stack_name))
+        return prefixes
+
+    def _get_service_name(self, summary: Dict[str, Any], stacks: Dict[str, str],
+                          stack_prefixes: Optional[Dict[str, Tuple[int, str]]] = None) -> str:
         """
         Get service name for a container.
         
         Args:
-            container (Container): Container object.
+            summary (dict): Container summary from the Docker list API.
             stacks (dict): Dictionary of stack names to stack IDs.
+            stack_prefixes (dict, optional): Prefix map from _build_stack_prefixes,
+                                             built from stacks when omitted.
             
         Returns:
             str: Service name.
         """
-        # Check for Docker Compose project label
-        labels = container.labels if hasattr(container, 'labels') else {}
-        
-        # Try to get from Docker Compose labels
-        if 'com.docker.compose.project' in labels:
-            return labels['com.docker.compose.project']
-        
-        if 'io.docker.compose.project' in labels:
-            return labels['io.docker.compose.project']
-        
-        # Try to get from Portainer labels
-        if 'io.portainer.stackname' in labels:
-            return labels['io.portainer.stackname']
-        
-        # Try to get from container name (common prefixes)
-        container_name = container.name
-        for stack_name in stacks.keys():
-            if container_name.startswith(f"{stack_name}_"):
-                return stack_name
+        # Try Docker Compose, then Portainer labels
+        labels = summary.get('Labels') or {}
+        for key in _SERVICE_LABEL_KEYS:
+            service_name = labels.get(key)
+            if service_name:
+                return sys.intern(service_name)
+        
+        # Try to get from container name (common prefixes): only the prefixes
+        # ending at an underscore can match, so look those up directly
+        if stack_prefixes is None:
+            stack_prefixes = self._build_stack_prefixes(stacks)
+        container_name = summary['Names'][0].lstrip('/')
+        matches = [
+            stack_prefixes[container_name[:i + 1]]
+            for i, char in enumerate(container_name)
+            if char == '_' and container_name[:i + 1] in stack_prefixes
+        ]
+        if matches:
+            # Several stacks can prefix one name; keep the first in stack order
+            return sys.intern(min(matches)[1])
         
         # Fallback: use container name as service name
-        return container_name
+        return sys.intern(container_name)
 
-    def _is_excluded(self, service_name: str) -> bool:
+    def _build_exclusion_set(self) -> frozenset:
         """
-        Check if a service is excluded from backup.
+        Parse the services excluded through the environment.
         
-        Args:
-            service_name (str): Name of the service.
-            
         Returns:
-            bool: True if excluded, False otherwise.
+            frozenset: Lowercased names from EXCLUDE_FROM_BACKUP.
         """
         # Get exclusion environment variable
         exclude_env = os.environ.get('EXCLUDE_FROM_BACKUP', '')
         
-        # Initialize empty list
-        excluded_services = []
-        
-        # Parse environment variable - handle multiple formats
-        if exclude_env:
-            # First split by commas (if any)
-            comma_items = exclude_env.split(',')
-            
-            # Then handle space-separated items
-            for item in comma_items:
-                space_items = item.split()
-                excluded_services.extend([s.strip().lower() for s in space_items if s.strip()])
+        # Split by commas and whitespace alike
+        excluded_services = frozenset(
+            name.lower() for item in exclude_env.split(',') for name in item.split())
         
         # Log parsed exclusions for debugging
-        logger.debug(f"Parsed excluded services: {excluded_services}")
-        
-        # Check configuration for excluded services
-        config = self.config_manager.get_service_config(service_name)
-        config_excluded = config.get('global', {}).get('exclude_from_backup', False)
-        
-        # Check if service name is in excluded list (case-insensitive)
-        is_excluded = service_name.lower() in excluded_services or config_excluded
-        
-        if is_excluded:
-            logger.info(f"Service {service_name} is excluded from backup")
-        
-        return is_excluded
-        
+        logger.debug(f"Parsed excluded services: {sorted(excluded_services)}")
+        return excluded_services
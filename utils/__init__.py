@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Utility modules for service-oriented Docker backup system.
+Modules import the top-level logger module, so the application directory
+must be on the import path (as it is when running main.py).
+"""
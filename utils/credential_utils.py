@@ -7,18 +7,16 @@ Provides functions for credential management and parsing.
 """
 
 import re
-import copy
 from typing import Dict, List, Any, Optional, Union
 from urllib.parse import urlparse, parse_qs
 
-# Assuming logger.py is in the parent directory
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Keys and values containing any of these words are masked in logs
+_SENSITIVE_RE = re.compile(r'password|secret|token|key|pass|auth', re.IGNORECASE)
+
 
 def parse_database_url(url: str) -> Optional[Dict[str, str]]:
     """
@@ -100,11 +98,10 @@ def find_credential_in_env(env_vars: Dict[str, str], possible_keys: List[str]) -
     if not env_vars or not possible_keys:
         return None
     
-    # Try each key in order
+    # Try each key in order; one hash lookup per candidate
     for key in possible_keys:
-        if key in env_vars and env_vars[key]:
-            value = env_vars[key]
-            
+        value = env_vars.get(key)
+        if value:
             # Handle variable references
             if isinstance(value, str) and value.startswith('$'):
                 value = resolve_env_var(value, env_vars)
@@ -157,24 +154,25 @@ def resolve_env_var_references(env_vars: Dict[str, str]) -> Dict[str, str]:
     if not env_vars:
         return {}
     
-    resolved = copy.deepcopy(env_vars)
+    resolved = {}
     
-    # Multiple passes to handle nested references
-    for _ in range(3):  # Limit to prevent infinite loops
-        any_resolved = False
-        
-        for key, value in resolved.items():
-            if isinstance(value, str):
-                new_value = resolve_env_var(value, resolved)
-                if new_value != value:
-                    resolved[key] = new_value
-                    any_resolved = True
-        
-        # If no variables were resolved in this pass, we're done
-        if not any_resolved:
-            break
+    def _resolve(key: str, seen: frozenset) -> Any:
+        # Each key is resolved once; nested references are followed through
+        # the cache, and a reference back into the chain is left as is
+        if key in resolved:
+            return resolved[key]
+        value = env_vars[key]
+        if isinstance(value, str) and value.startswith('$'):
+            if value.startswith('${') and value.endswith('}'):
+                var_name = value[2:-1]
+            else:
+                var_name = value[1:]
+            if var_name in env_vars and var_name not in seen:
+                value = _resolve(var_name, seen | {key})
+        resolved[key] = value
+        return value
     
-    return resolved
+    return {key: _resolve(key, frozenset()) for key in env_vars}
 
 
 def extract_database_credentials(env_vars: Dict[str, str], 
@@ -334,8 +332,7 @@ def mask_sensitive_data(data: Any) -> Any:
         masked = {}
         for key, value in data.items():
             # Mask sensitive keys
-            if any(sensitive in key.lower() for sensitive in 
-                  ['password', 'secret', 'token', 'key', 'pass', 'auth']):
+            if _SENSITIVE_RE.search(key):
                 if value and isinstance(value, str):
                     masked[key] = '********'
                 else:
@@ -349,7 +346,7 @@ def mask_sensitive_data(data: Any) -> Any:
         # Check if the string looks like a password or token
         if len(data) > 8 and any(c.isdigit() for c in data) and any(c.isalpha() for c in data):
             # Check if it matches common secret patterns
-            if re.search(r'(password|secret|token|key|pass|auth)', data, re.IGNORECASE):
+            if _SENSITIVE_RE.search(data):
                 return '********'
         return data
     else:
@@ -8,33 +8,84 @@ considerations to minimize privilege escalation risks.
 """
 
 import os
+import operator
 import time
+import random
 import re
-from typing import Dict, List, Any, Optional, Union, Tuple, Set
-
-try:
-    import docker
-    from docker.errors import DockerException, NotFound, APIError
-    DOCKER_AVAILABLE = True
-except ImportError:
-    DOCKER_AVAILABLE = False
-
-# Assuming logger.py is in the parent directory
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
+import threading
+import concurrent.futures
+import importlib.util
+from typing import Dict, FrozenSet, List, Any, Optional, Union, Tuple, Set
+
+# The Docker SDK pulls in requests, urllib3 and websocket-client, so it is only
+# imported, by _import_docker, once something actually talks to the daemon
+DOCKER_AVAILABLE = importlib.util.find_spec('docker') is not None
+docker = None
+
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 # Define allowed Docker API operations to reduce security risks
-# This implements a form of least-privilege access to Docker API
-ALLOWED_OPERATIONS = {
-    'containers': {'list', 'get', 'logs', 'exec_run'},
-    'images': {'list', 'get'},
-    'networks': {'list'},
-    'volumes': {'list'}
-}
+# This implements a form of least-privilege access to Docker API.
+# Entries are "collection.operation", so each check is a single lookup
+ALLOWED_OPERATIONS = frozenset({
+    'containers.list', 'containers.get', 'containers.logs', 'containers.exec_run',
+    'images.list', 'images.get',
+    'networks.list',
+    'volumes.list',
+    'api.containers'
+})
+
+# Attributes every container object must have; fetched in one call, raising
+# AttributeError if any is missing
+_REQUIRED_CONTAINER_ATTRS = operator.attrgetter('id', 'name', 'attrs')
+
+# Container names, and full or short hex container IDs
+_CONTAINER_NAME_RE = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9_.-]{1,63}$')
+_CONTAINER_HEX_ID_RE = re.compile(r'^[a-f0-9]{12,64}$')
+
+# Database dumps and file backups run in parallel across and within services;
+# bound the number of exec sessions open against the daemon at once
+_EXEC_SEMAPHORE = threading.BoundedSemaphore(
+    max(1, int(os.environ.get('DOCKER_EXEC_CONCURRENCY', '8'))))
+
+# When exec output is streamed to a writer, only this much of its end is kept
+# for the returned output (enough for an error message)
+_EXEC_OUTPUT_TAIL = 4096
+
+# Backoff between connection attempts, in seconds; doubled per retry up to the cap
+_CONNECT_RETRY_DELAY = 0.5
+_CONNECT_MAX_BACKOFF = 10
+
+# Container inspects are independent HTTP round-trips; run this many at once.
+# Kept below the SDK's default connection pool size of 10
+_INSPECT_CONCURRENCY = max(1, int(os.environ.get('DOCKER_INSPECT_CONCURRENCY', '8')))
+
+# One client (and its HTTP connection pool) is shared by every helper;
+# created on first use by get_docker_client
+_docker_client = None
+_docker_client_lock = threading.Lock()
+
+# get_container_by_id results are reused for this many seconds (0 disables);
+# keyed by (container ID or name, client)
+_INSPECT_CACHE_TTL = float(os.environ.get('DOCKER_INSPECT_CACHE_TTL', '5'))
+_container_cache: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+_container_cache_lock = threading.Lock()
+
+
+def _import_docker() -> Optional[Any]:
+    """
+    Import the Docker SDK on first use.
+    
+    Returns:
+        module or None: The docker module, or None if it is not installed.
+    """
+    global docker
+    if docker is None and DOCKER_AVAILABLE:
+        # Binds the module-level name; docker.errors is loaded along with it
+        import docker.errors
+    return docker
 
 
 def validate_docker_environment() -> bool:
@@ -45,7 +96,7 @@ def validate_docker_environment() -> bool:
     Returns:
         bool: True if environment is valid, False otherwise.
     """
-    if not DOCKER_AVAILABLE:
+    if _import_docker() is None:
         logger.error("Docker SDK for Python not installed. Install with: pip install docker")
         return False
     
@@ -53,7 +104,7 @@ def validate_docker_environment() -> bool:
     try:
         client = docker.from_env()
         client.ping()
-    except DockerException as e:
+    except docker.errors.DockerException as e:
         logger.error(f"Cannot connect to Docker daemon: {str(e)}")
         
         # Check if this is a permission issue
@@ -98,15 +149,54 @@ def validate_docker_environment() -> bool:
     
     return True
 
+
 def get_docker_client() -> Optional['docker.DockerClient']:
     """
-    Get a Docker client instance with retries on failure.
+    Get the shared Docker client, connecting with retries on first use.
     Uses read-only access where possible to reduce privilege escalation risks.
     
+    The client is created and pinged once, then reused by every caller;
+    a failed connection is not cached, so the next call tries again.
+    
+    Returns:
+        docker.DockerClient or None: Docker client instance or None if failed.
+    """
+    global _docker_client
+    
+    client = _docker_client
+    if client is not None:
+        return client
+    
+    with _docker_client_lock:
+        if _docker_client is None:
+            _docker_client = _connect_docker_client()
+        return _docker_client
+
+
+def close_docker_client() -> None:
+    """
+    Close the shared Docker client and its connection pool, if one is open.
+    """
+    global _docker_client
+    
+    with _docker_client_lock:
+        client, _docker_client = _docker_client, None
+    
+    if client is not None:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing Docker client: {str(e)}")
+
+
+def _connect_docker_client() -> Optional['docker.DockerClient']:
+    """
+    Connect to the Docker daemon with retries on failure.
+    
     Returns:
         docker.DockerClient or None: Docker client instance or None if failed.
     """
-    if not DOCKER_AVAILABLE:
+    if _import_docker() is None:
         logger.error("Docker SDK for Python not installed. Install with: pip install docker")
         return None
     
@@ -116,7 +206,7 @@ def get_docker_client() -> Optional['docker.DockerClient']:
         logger.info("Using read-only Docker client for improved security")
     
     max_retries = 3
-    retry_delay = 2  # seconds
+    retry_delay = _CONNECT_RETRY_DELAY
     
     for attempt in range(max_retries):
         try:
@@ -132,13 +222,15 @@ def get_docker_client() -> Optional['docker.DockerClient']:
                 return ReadOnlyDockerClient(client)
             return client
             
-        except DockerException as e:
+        except docker.errors.DockerException as e:
             logger.warning(f"Docker connection attempt {attempt + 1}/{max_retries} failed: {str(e)}")
             
             if attempt < max_retries - 1:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
+                # Jitter keeps backup processes restarted together from retrying in lockstep
+                delay = retry_delay * random.uniform(0.5, 1.5)
+                logger.info(f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+                retry_delay = min(_CONNECT_MAX_BACKOFF, retry_delay * 2)  # Capped exponential backoff
             else:
                 logger.error("Failed to connect to Docker daemon after multiple attempts")
                 return None
@@ -166,28 +258,42 @@ class ReadOnlyDockerClient:
         self.images = RestrictedCollection(client.images, 'images', self._allowed_ops)
         self.networks = RestrictedCollection(client.networks, 'networks', self._allowed_ops)
         self.volumes = RestrictedCollection(client.volumes, 'volumes', self._allowed_ops)
+        self.api = RestrictedCollection(client.api, 'api', self._allowed_ops)
     
     def ping(self) -> bool:
         """Ping the Docker daemon to verify connection."""
         return self._client.ping()
+    
+    def close(self) -> None:
+        """Close the wrapped client's connection pool."""
+        self._client.close()
 
 
 class RestrictedCollection:
     """Wrapper for Docker collections that restricts operations."""
     
-    def __init__(self, collection: Any, collection_name: str, allowed_ops: Dict[str, Set[str]]):
+    def __init__(self, collection: Any, collection_name: str, allowed_ops: FrozenSet[str]):
         """
         Initialize with a Docker collection.
         
         Args:
             collection: Docker collection to wrap
             collection_name: Name of the collection (containers, images, etc.)
-            allowed_ops: Dictionary of allowed operations
+            allowed_ops: Allowed operations as "collection.operation" names
         """
         self._collection = collection
         self._collection_name = collection_name
         self._allowed_ops = allowed_ops
         
+        # Bind allowed operations up front; normal attribute lookup then finds
+        # them and __getattr__ only sees operations that are blocked. Not every
+        # collection has every allowed name (containers have no logs)
+        prefix = f"{collection_name}."
+        for operation in allowed_ops:
+            name = operation[len(prefix):]
+            if operation.startswith(prefix) and hasattr(collection, name):
+                setattr(self, name, getattr(collection, name))
+        
     def __getattr__(self, name: str) -> Any:
         """
         Get attribute from the collection, checking against allowed operations.
@@ -201,10 +307,10 @@ class RestrictedCollection:
         Raises:
             PermissionError: If operation is not allowed
         """
-        if self._collection_name in self._allowed_ops and name in self._allowed_ops[self._collection_name]:
+        operation = f"{self._collection_name}.{name}"
+        if operation in self._allowed_ops:
             return getattr(self._collection, name)
         else:
-            operation = f"{self._collection_name}.{name}"
             logger.warning(f"Blocked potentially dangerous Docker operation: {operation}")
             raise PermissionError(f"Operation not allowed: {operation}")
 
@@ -219,10 +325,14 @@ def _is_valid_container_id(container_id: str) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
+    # Neither form is ever longer than 64 characters
+    if not container_id or len(container_id) > 64:
+        return False
+    
     # Docker IDs are 64-character hex strings
     # Container names can be alphanumeric with some special chars
-    return bool(re.match(r'^[a-zA-Z0-9][a-zA-Z0-9_.-]{1,63}$', container_id) or 
-                re.match(r'^[a-f0-9]{12,64}$', container_id))
+    return bool(_CONTAINER_NAME_RE.match(container_id) or
+                _CONTAINER_HEX_ID_RE.match(container_id))
 
 
 def _is_valid_container(container: Any) -> bool:
@@ -239,37 +349,54 @@ def _is_valid_container(container: Any) -> bool:
         return False
     
     # Check for basic container attributes
-    required_attrs = ['id', 'name', 'attrs']
-    return all(hasattr(container, attr) for attr in required_attrs)
+    try:
+        _REQUIRED_CONTAINER_ATTRS(container)
+    except AttributeError:
+        return False
+    return True
 
 
-def get_container_by_id(container_id: str) -> Optional[Any]:
+def get_container_by_id(container_id: str, client: Optional[Any] = None) -> Optional[Any]:
     """
     Get container object by ID with error handling.
     Uses read-only access to reduce privilege escalation risks.
     
+    Successful lookups are cached for DOCKER_INSPECT_CACHE_TTL seconds, so
+    repeated lookups of the same container within a pass cost one inspect.
+    
     Args:
         container_id (str): Container ID or name.
+        client (DockerClient, optional): Client to use; defaults to the shared client.
         
     Returns:
         Container or None: Container object or None if not found/error.
     """
-    client = get_docker_client()
+    client = client or get_docker_client()
     if not client:
         return None
+    _import_docker()
     
     # Validate container ID to prevent injection
     if not _is_valid_container_id(container_id):
         logger.error(f"Invalid container ID format: {container_id}")
         return None
     
+    cache_key = (container_id, id(client))
+    if _INSPECT_CACHE_TTL > 0:
+        cached = _container_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < _INSPECT_CACHE_TTL:
+            return cached[1]
+    
     try:
         container = client.containers.get(container_id)
+        if _INSPECT_CACHE_TTL > 0:
+            with _container_cache_lock:
+                _container_cache[cache_key] = (time.monotonic(), container)
         return container
-    except NotFound:
+    except docker.errors.NotFound:
         logger.warning(f"Container not found: {container_id}")
         return None
-    except APIError as e:
+    except docker.errors.APIError as e:
         logger.error(f"API error getting container {container_id}: {str(e)}")
         return None
     except Exception as e:
@@ -277,6 +404,108 @@ def get_container_by_id(container_id: str) -> Optional[Any]:
         return None
 
 
+def _invalidate_container_cache(container_id: str) -> None:
+    """
+    Drop cached lookups of a container, along with any expired entries.
+    
+    Args:
+        container_id (str): Full container ID.
+    """
+    now = time.monotonic()
+    with _container_cache_lock:
+        for key, (cached_at, container) in list(_container_cache.items()):
+            if container.id == container_id or now - cached_at >= _INSPECT_CACHE_TTL:
+                del _container_cache[key]
+
+
+def get_containers_by_ids(container_ids: List[str], client: Optional[Any] = None) -> List[Any]:
+    """
+    Get several containers by ID with a single list call.
+    
+    When every ID is already a full 64-character ID the list call is skipped
+    and the containers are inspected directly.
+    
+    Args:
+        container_ids (list): Full or short container IDs.
+        client (DockerClient, optional): Client to use; defaults to the shared client.
+        
+    Returns:
+        list: Container objects found, in the order of container_ids.
+    """
+    if not container_ids:
+        return []
+    
+    invalid_ids = [container_id for container_id in container_ids
+                   if not _is_valid_container_id(container_id)]
+    if invalid_ids:
+        logger.error(f"Invalid container ID format: {', '.join(invalid_ids)}")
+        return []
+    
+    client = client or get_docker_client()
+    if not client:
+        return []
+    
+    try:
+        if all(len(container_id) == 64 and _CONTAINER_HEX_ID_RE.match(container_id)
+               for container_id in container_ids):
+            full_ids = list(container_ids)
+        else:
+            # The daemon's id filter matches ID prefixes, so short IDs work too
+            summaries = client.api.containers(all=True, filters={"id": list(container_ids)})
+            full_ids = [summary['Id'] for summary in summaries]
+        containers = _inspect_containers(client, full_ids)
+    except Exception as e:
+        logger.error(f"Error getting containers: {str(e)}")
+        return []
+    
+    by_id = {container.id: container for container in containers}
+    found = []
+    for container_id in container_ids:
+        container = by_id.get(container_id) or next(
+            (c for c in containers if c.id.startswith(container_id)), None)
+        if container is None:
+            logger.warning(f"Container not found: {container_id}")
+        else:
+            found.append(container)
+    return found
+
+
+def extract_container_metadata(container: Any) -> Dict[str, Any]:
+    """
+    Get environment variables, mounts and networks for a container at once.
+    Uses read-only access to reduce privilege escalation risks.
+    
+    The container is validated and its inspect data read once, rather than
+    once per field as with the individual getters.
+    
+    Args:
+        container (Container): Container object.
+        
+    Returns:
+        dict: 'environment', 'mounts' and 'networks' in the formats returned
+        by get_container_environment, get_container_mounts and
+        get_container_networks.
+    """
+    metadata = {'environment': {}, 'mounts': [], 'networks': {}}
+    
+    try:
+        # Validate container object
+        if not _is_valid_container(container):
+            logger.error("Invalid container object provided")
+            return metadata
+        
+        attrs = container.attrs
+        metadata['environment'] = _parse_environment(attrs)
+        metadata['mounts'] = _parse_mounts(attrs)
+        metadata['networks'] = _parse_networks(attrs)
+        return metadata
+        
+    except Exception as e:
+        container_name = getattr(container, 'name', 'unknown')
+        logger.error(f"Error getting metadata for container {container_name}: {str(e)}")
+        return metadata
+
+
 def get_container_environment(container: Any) -> Dict[str, str]:
     """
     Get environment variables for a container.
@@ -288,25 +517,13 @@ def get_container_environment(container: Any) -> Dict[str, str]:
     Returns:
         dict: Dictionary of environment variables.
     """
-    env_vars = {}
-    
     try:
         # Validate container object
         if not _is_valid_container(container):
             logger.error("Invalid container object provided")
             return {}
         
-        # Get environment from container inspect data
-        if hasattr(container, 'attrs') and 'Config' in container.attrs:
-            env_list = container.attrs['Config'].get('Env', [])
-            
-            # Parse environment variables
-            for env_str in env_list:
-                if '=' in env_str:
-                    key, value = env_str.split('=', 1)
-                    env_vars[key] = value
-        
-        return env_vars
+        return _parse_environment(container.attrs)
         
     except Exception as e:
         container_name = getattr(container, 'name', 'unknown')
@@ -325,68 +542,13 @@ def get_container_mounts(container: Any) -> List[Dict[str, Any]]:
     Returns:
         list: List of mount objects with normalized data.
     """
-    mounts = []
-    
     try:
         # Validate container object
         if not _is_valid_container(container):
             logger.error("Invalid container object provided")
             return []
         
-        # Get mounts from container inspect data
-        if hasattr(container, 'attrs') and 'Mounts' in container.attrs:
-            raw_mounts = container.attrs['Mounts']
-            
-            for mount in raw_mounts:
-                # Normalize mount information
-                mount_info = {
-                    'type': mount.get('Type', 'unknown'),
-                    'source': mount.get('Source', ''),
-                    'destination': mount.get('Destination', ''),
-                    'mode': mount.get('Mode', 'rw'),
-                    'rw': mount.get('RW', True),
-                    'propagation': mount.get('Propagation', '')
-                }
-                mounts.append(mount_info)
-        
-        # Alternative path for newer Docker versions
-        elif hasattr(container, 'attrs') and 'HostConfig' in container.attrs:
-            host_config = container.attrs['HostConfig']
-            
-            # Check for Binds
-            if 'Binds' in host_config and host_config['Binds']:
-                for bind in host_config['Binds']:
-                    parts = bind.split(':')
-                    if len(parts) >= 2:
-                        source, destination = parts[0], parts[1]
-                        mode = 'rw'
-                        if len(parts) >= 3:
-                            mode = parts[2]
-                        
-                        mount_info = {
-                            'type': 'bind',
-                            'source': source,
-                            'destination': destination,
-                            'mode': mode,
-                            'rw': 'ro' not in mode,
-                            'propagation': ''
-                        }
-                        mounts.append(mount_info)
-            
-            # Check for Volumes
-            if 'Volumes' in host_config and host_config['Volumes']:
-                for dest, source in host_config['Volumes'].items():
-                    mount_info = {
-                        'type': 'volume',
-                        'source': source if source else '',
-                        'destination': dest,
-                        'mode': 'rw',
-                        'rw': True,
-                        'propagation': ''
-                    }
-                    mounts.append(mount_info)
-        
-        return mounts
+        return _parse_mounts(container.attrs)
         
     except Exception as e:
         container_name = getattr(container, 'name', 'unknown')
@@ -405,28 +567,13 @@ def get_container_networks(container: Any) -> Dict[str, Dict[str, Any]]:
     Returns:
         dict: Dictionary of network information by network name.
     """
-    networks = {}
-    
     try:
         # Validate container object
         if not _is_valid_container(container):
             logger.error("Invalid container object provided")
             return {}
         
-        # Get networks from container inspect data
-        if hasattr(container, 'attrs') and 'NetworkSettings' in container.attrs:
-            network_settings = container.attrs['NetworkSettings']
-            
-            if 'Networks' in network_settings:
-                for network_name, network_config in network_settings['Networks'].items():
-                    networks[network_name] = {
-                        'ip_address': network_config.get('IPAddress', ''),
-                        'gateway': network_config.get('Gateway', ''),
-                        'mac_address': network_config.get('MacAddress', ''),
-                        'network_id': network_config.get('NetworkID', '')
-                    }
-        
-        return networks
+        return _parse_networks(container.attrs)
         
     except Exception as e:
         container_name = getattr(container, 'name', 'unknown')
@@ -434,27 +581,237 @@ def get_container_networks(container: Any) -> Dict[str, Dict[str, Any]]:
         return {}
 
 
-def get_running_containers() -> List[Any]:
+def _parse_environment(attrs: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Parse environment variables from container inspect data.
+    
+    Args:
+        attrs (dict): Container inspect data.
+        
+    Returns:
+        dict: Dictionary of environment variables.
+    """
+    env_vars = {}
+    
+    # Get environment from container inspect data
+    if 'Config' in attrs:
+        env_list = attrs['Config'].get('Env') or []
+        
+        # Parse KEY=value pairs; an empty separator means there was no '='
+        env_vars = {key: value for key, sep, value in
+                    (env_str.partition('=') for env_str in env_list) if sep}
+    
+    return env_vars
+
+
+def _parse_mounts(attrs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Parse volume mounts from container inspect data.
+    
+    Args:
+        attrs (dict): Container inspect data.
+        
+    Returns:
+        list: List of mount objects with normalized data.
+    """
+    mounts = []
+    
+    # Get mounts from container inspect data
+    if 'Mounts' in attrs:
+        raw_mounts = attrs['Mounts']
+        
+        for mount in raw_mounts:
+            # Normalize mount information
+            get = mount.get
+            mounts.append({
+                'type': get('Type', 'unknown'),
+                'source': get('Source', ''),
+                'destination': get('Destination', ''),
+                'mode': get('Mode', 'rw'),
+                'rw': get('RW', True),
+                'propagation': get('Propagation', '')
+            })
+    
+    # Alternative path for newer Docker versions
+    elif 'HostConfig' in attrs:
+        host_config = attrs['HostConfig']
+        
+        # Check for Binds
+        if 'Binds' in host_config and host_config['Binds']:
+            for bind in host_config['Binds']:
+                # source:destination[:options]; stop splitting after the destination
+                parts = bind.split(':', 2)
+                if len(parts) >= 2:
+                    source, destination = parts[0], parts[1]
+                    mode = parts[2] if len(parts) == 3 else 'rw'
+                    
+                    mount_info = {
+                        'type': 'bind',
+                        'source': source,
+                        'destination': destination,
+                        'mode': mode,
+                        'rw': 'ro' not in mode.split(','),
+                        'propagation': ''
+                    }
+                    mounts.append(mount_info)
+        
+        # Check for Volumes
+        if 'Volumes' in host_config and host_config['Volumes']:
+            for dest, source in host_config['Volumes'].items():
+                mount_info = {
+                    'type': 'volume',
+                    'source': source if source else '',
+                    'destination': dest,
+                    'mode': 'rw',
+                    'rw': True,
+                    'propagation': ''
+                }
+                mounts.append(mount_info)
+    
+    return mounts
+
+
+def _parse_networks(attrs: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse networks from container inspect data.
+    
+    Args:
+        attrs (dict): Container inspect data.
+        
+    Returns:
+        dict: Dictionary of network information by network name.
+    """
+    networks = {}
+    
+    # Get networks from container inspect data
+    if 'NetworkSettings' in attrs:
+        network_settings = attrs['NetworkSettings']
+        
+        if 'Networks' in network_settings:
+            for network_name, network_config in network_settings['Networks'].items():
+                get = network_config.get
+                networks[network_name] = {
+                    'ip_address': get('IPAddress', ''),
+                    'gateway': get('Gateway', ''),
+                    'mac_address': get('MacAddress', ''),
+                    'network_id': get('NetworkID', '')
+                }
+    
+    return networks
+
+
+def get_running_containers(client: Optional[Any] = None) -> List[Any]:
     """
     Get all running containers.
     Uses read-only access to reduce privilege escalation risks.
     
+    Args:
+        client (DockerClient, optional): Client to use; defaults to the shared client.
+        
     Returns:
         list: List of running container objects.
     """
-    client = get_docker_client()
+    client = client or get_docker_client()
     if not client:
         return []
     
     try:
-        containers = client.containers.list(filters={"status": "running"})
+        summaries = get_running_container_summaries(client)
+        containers = _inspect_containers(client, [summary['Id'] for summary in summaries])
         logger.info(f"Found {len(containers)} running containers")
         return containers
     except Exception as e:
         logger.error(f"Error getting running containers: {str(e)}")
         return []
 
-def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]] = None) -> Tuple[int, str]:
+
+def get_running_container_summaries(client: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """
+    Get the list summaries of all running containers.
+    
+    Uses the low-level API, so no Container object is built per result.
+    Use this for passes that only need IDs, names, images or labels.
+    
+    Args:
+        client (DockerClient, optional): Client to use; defaults to the shared client.
+        
+    Returns:
+        list: Summary dicts as returned by the Docker API (Id, Names, Image,
+        State, Labels, ...).
+    """
+    client = client or get_docker_client()
+    if not client:
+        return []
+    
+    try:
+        return client.api.containers(filters={"status": "running"})
+    except Exception as e:
+        logger.error(f"Error getting running container summaries: {str(e)}")
+        return []
+
+
+def _inspect_containers(client: Any, container_ids: List[str]) -> List[Any]:
+    """
+    Inspect several containers concurrently.
+    
+    The SDK's non-sparse list inspects each container one after another;
+    issuing the inspects from a thread pool overlaps their round-trips.
+    
+    Args:
+        client (DockerClient): Docker client.
+        container_ids (list): Full container IDs.
+        
+    Returns:
+        list: Container objects, in the order of container_ids, skipping
+        containers removed since they were listed.
+    """
+    _import_docker()
+    
+    def inspect(container_id: str) -> Optional[Any]:
+        try:
+            return client.containers.get(container_id)
+        except docker.errors.NotFound:
+            return None
+    
+    if len(container_ids) <= 1:
+        containers = [inspect(container_id) for container_id in container_ids]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(_INSPECT_CONCURRENCY, len(container_ids))) as executor:
+            containers = list(executor.map(inspect, container_ids))
+    
+    return [container for container in containers if container is not None]
+
+
+def get_container_statuses(container_ids: List[str],
+                           client: Optional[Any] = None) -> Optional[Dict[str, str]]:
+    """
+    Get the current status of several containers with a single list call.
+    
+    Args:
+        container_ids (list): IDs of the containers to look up.
+        client (DockerClient, optional): Client to use; defaults to the shared client.
+        
+    Returns:
+        dict or None: Container ID to status, or None if the lookup failed.
+    """
+    if not container_ids:
+        return {}
+    
+    client = client or get_docker_client()
+    if not client:
+        return None
+    
+    try:
+        # The low-level list returns plain dicts; no Container objects are built
+        summaries = client.api.containers(all=True, filters={"id": list(container_ids)})
+        return {summary['Id']: summary['State'] for summary in summaries}
+    except Exception as e:
+        logger.error(f"Error getting container statuses: {str(e)}")
+        return None
+
+def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]] = None,
+                      output_writer: Optional[Any] = None) -> Tuple[int, str]:
     """
     Execute a command in a container with robust error handling.
     Uses BusyBox-compatible command syntax.
@@ -463,6 +820,9 @@ def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]
         container (Container): Docker container object.
         command (str): Command to execute.
         env (dict, optional): Environment variables for the command.
+        output_writer (BinaryIO, optional): Receives the raw output as it is
+            produced, so large outputs are never held in memory. The returned
+            output is then only the last few KiB.
         
     Returns:
         tuple: (exit_code, output) tuple.
@@ -481,6 +841,9 @@ def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]
         # Default environment variables
         env = env or {}
         
+        # The command may change the container's state; don't serve it from cache
+        _invalidate_container_cache(container.id)
+        
         # First try to refresh container information
         try:
             container.reload()
@@ -489,8 +852,9 @@ def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]
             # Continue anyway, as the container might still be usable
         
         # Check if container is running - use busybox-compatible syntax
-        if hasattr(container, 'status') and container.status != 'running':
-            logger.warning(f"Container {container.name} is not running (status: {container.status})")
+        status = container.status
+        if status != 'running':
+            logger.warning(f"Container {container.name} is not running (status: {status})")
             
             # Try alternatives - 1. Direct CLI check as a fallback
             try:
@@ -516,22 +880,20 @@ def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]
             logger.debug(f"Adjusted command for BusyBox compatibility: {busybox_command}")
         
         # Try to execute the command with additional error context
+        _import_docker()
         try:
             logger.debug(f"Executing in {container.name} (ID: {container.id[:12]}): {busybox_command}")
             
             # Set an execution timeout to prevent hanging
             timeout = int(os.environ.get('DOCKER_EXEC_TIMEOUT', '300'))  # 5 minutes default
             
-            result = container.exec_run(
-                cmd=["sh", "-c", busybox_command],  # Use sh -c for consistent shell behavior
-                environment=env,
-                detach=False,
-                tty=False,
-                demux=False
-            )
-            
-            exit_code = result.exit_code
-            output = result.output.decode('utf-8', errors='replace')
+            with _EXEC_SEMAPHORE:
+                exit_code, output = _exec_stream(
+                    container,
+                    ["sh", "-c", busybox_command],  # Use sh -c for consistent shell behavior
+                    env,
+                    output_writer
+                )
             
             if exit_code != 0:
                 logger.warning(f"Command in {container.name} exited with code {exit_code}: {output}")
@@ -569,6 +931,37 @@ def exec_in_container(container: Any, command: str, env: Optional[Dict[str, str]
         logger.error(f"Error executing command in {container_name} ({container_id}): {str(e)}")
         return -1, str(e)
 
+def _exec_stream(container: Any, cmd: List[str], env: Dict[str, str],
+                 output_writer: Optional[Any] = None) -> Tuple[int, str]:
+    """
+    Run an exec session and consume its output as a stream of chunks.
+    
+    Args:
+        container (Container): Docker container object.
+        cmd (list): Command and arguments.
+        env (dict): Environment variables for the command.
+        output_writer (BinaryIO, optional): Receives each output chunk.
+        
+    Returns:
+        tuple: (exit_code, output); output is the tail of the stream when
+        output_writer is given.
+    """
+    api = container.client.api
+    exec_id = api.exec_create(container.id, cmd, environment=env, tty=False)['Id']
+    chunks = api.exec_start(exec_id, tty=False, stream=True, demux=False)
+    
+    if output_writer is None:
+        output = b''.join(chunks)
+    else:
+        output = b''
+        for chunk in chunks:
+            output_writer.write(chunk)
+            output = (output + chunk)[-_EXEC_OUTPUT_TAIL:]
+    
+    exit_code = api.exec_inspect(exec_id)['ExitCode']
+    return exit_code, output.decode('utf-8', errors='replace')
+
+
 def _make_busybox_compatible(command: str) -> str:
     """
     Convert command to be compatible with BusyBox shell.
@@ -630,209 +1023,6 @@ def _make_busybox_compatible(command: str) -> str:
     # Return modified command
     return command
 
-def validate_docker_environment() -> bool:
-    """
-    Validate the Docker environment and permissions.
-    Checks socket permissions and warns about potential security issues.
-    
-    Returns:
-        bool: True if environment is valid, False otherwise.
-    """
-    if not DOCKER_AVAILABLE:
-        logger.error("Docker SDK for Python not installed. Install with: pip install docker")
-        return False
-    
-    # Check if Docker socket is accessible
-    try:
-        client = docker.from_env()
-        client.ping()
-    except DockerException as e:
-        logger.error(f"Cannot connect to Docker daemon: {str(e)}")
-        
-        # Check if this is a permission issue
-        if "permission denied" in str(e).lower():
-            logger.error("Permission denied accessing Docker socket. This could be due to:")
-            logger.error("  1. The user running this application is not in the 'docker' group")
-            logger.error("  2. The Docker socket is not accessible to the current user")
-            logger.error("  3. The container does not have the Docker socket properly mounted")
-            logger.error("\nPossible solutions:")
-            logger.error("  - Add the user to the 'docker' group: sudo usermod -aG docker $USER")
-            logger.error("  - Restart the container with proper socket mounting")
-            logger.error("  - Use a Docker socket proxy for improved security")
-        
-        return False
-    
-    # Check if we're running in a container and with proper security
-    if os.path.exists('/.dockerenv'):
-        logger.info("Running inside a Docker container")
-        
-        # Check if Docker socket is mounted with potentially unsafe permissions
-        docker_socket_path = '/var/run/docker.sock'
-        if os.path.exists(docker_socket_path):
-            socket_stat = os.stat(docker_socket_path)
-            
-            # Check if socket has wide permissions
-            if socket_stat.st_mode & 0o002:  # world-writable
-                logger.warning("Docker socket has world-writable permissions - this is a security risk")
-            
-            # Check if socket is mounted directly
-            logger.warning("Docker socket is mounted directly into the container. For improved security:")
-            logger.warning("  1. Consider using a Docker socket proxy (tecnativa/docker-socket-proxy)")
-            logger.warning("  2. Mount the socket as read-only: docker.sock:/var/run/docker.sock:ro")
-            logger.warning("  3. Enable DOCKER_READ_ONLY=true in environment variables")
-    
-    # Log that we're using read-only mode for security
-    read_only = os.environ.get('DOCKER_READ_ONLY', 'true').lower() in ('true', '1', 'yes')
-    if read_only:
-        logger.info("Docker read-only mode is enabled for improved security")
-    else:
-        logger.warning("Docker read-only mode is disabled - this reduces security")
-        logger.warning("Set DOCKER_READ_ONLY=true for improved security")
-    
-    return True
-
-def get_docker_client() -> Optional['docker.DockerClient']:
-    """
-    Get a Docker client instance with retries on failure.
-    Uses read-only access where possible to reduce privilege escalation risks.
-    
-    Returns:
-        docker.DockerClient or None: Docker client instance or None if failed.
-    """
-    if not DOCKER_AVAILABLE:
-        logger.error("Docker SDK for Python not installed. Install with: pip install docker")
-        return None
-    
-    # Check for read-only mode configuration
-    read_only = os.environ.get('DOCKER_READ_ONLY', 'true').lower() in ('true', '1', 'yes')
-    if read_only:
-        logger.info("Using read-only Docker client for improved security")
-    
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    for attempt in range(max_retries):
-        try:
-            # Use environment variables (DOCKER_HOST, etc.) if available
-            client = docker.from_env()
-            
-            # Test connection
-            client.ping()
-            logger.debug("Successfully connected to Docker daemon")
-            
-            # If in read-only mode, wrap the client with security checks
-            if read_only:
-                return ReadOnlyDockerClient(client)
-            return client
-            
-        except DockerException as e:
-            logger.warning(f"Docker connection attempt {attempt + 1}/{max_retries} failed: {str(e)}")
-            
-            if attempt < max_retries - 1:
-                logger.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                retry_delay *= 2  # Exponential backoff
-            else:
-                logger.error("Failed to connect to Docker daemon after multiple attempts")
-                return None
-
-class ReadOnlyDockerClient:
-    """
-    Wrapper around Docker client that restricts operations to read-only
-    to reduce privilege escalation risks.
-    """
-    
-    def __init__(self, client: 'docker.DockerClient'):
-        """
-        Initialize with a Docker client.
-        
-        Args:
-            client: Docker client to wrap
-        """
-        self._client = client
-        self._allowed_ops = ALLOWED_OPERATIONS
-        logger.debug("Initialized read-only Docker client wrapper")
-        
-        # Initialize restricted access to collection attributes
-        self.containers = RestrictedCollection(client.containers, 'containers', self._allowed_ops)
-        self.images = RestrictedCollection(client.images, 'images', self._allowed_ops)
-        self.networks = RestrictedCollection(client.networks, 'networks', self._allowed_ops)
-        self.volumes = RestrictedCollection(client.volumes, 'volumes', self._allowed_ops)
-    
-    def ping(self) -> bool:
-        """Ping the Docker daemon to verify connection."""
-        return self._client.ping()
-
-
-class RestrictedCollection:
-    """Wrapper for Docker collections that restricts operations."""
-    
-    def __init__(self, collection: Any, collection_name: str, allowed_ops: Dict[str, Set[str]]):
-        """
-        Initialize with a Docker collection.
-        
-        Args:
-            collection: Docker collection to wrap
-            collection_name: Name of the collection (containers, images, etc.)
-            allowed_ops: Dictionary of allowed operations
-        """
-        self._collection = collection
-        self._collection_name = collection_name
-        self._allowed_ops = allowed_ops
-        
-    def __getattr__(self, name: str) -> Any:
-        """
-        Get attribute from the collection, checking against allowed operations.
-        
-        Args:
-            name: Attribute name
-            
-        Returns:
-            Attribute value
-            
-        Raises:
-            PermissionError: If operation is not allowed
-        """
-        if self._collection_name in self._allowed_ops and name in self._allowed_ops[self._collection_name]:
-            return getattr(self._collection, name)
-        else:
-            operation = f"{self._collection_name}.{name}"
-            logger.warning(f"Blocked potentially dangerous Docker operation: {operation}")
-            raise PermissionError(f"Operation not allowed: {operation}")
-
-def _is_valid_container_id(container_id: str) -> bool:
-    """
-    Validate container ID format to prevent injection attacks.
-    
-    Args:
-        container_id: Container ID or name to validate
-        
-    Returns:
-        bool: True if valid, False otherwise
-    """
-    # Docker IDs are 64-character hex strings
-    # Container names can be alphanumeric with some special chars
-    return bool(re.match(r'^[a-zA-Z0-9][a-zA-Z0-9_.-]{1,63}$', container_id) or 
-                re.match(r'^[a-f0-9]{12,64}$', container_id))
-
-
-def _is_valid_container(container: Any) -> bool:
-    """
-    Validate a container object.
-    
-    Args:
-        container: Container object to validate
-        
-    Returns:
-        bool: True if valid, False otherwise
-    """
-    if not container:
-        return False
-    
-    # Check for basic container attributes
-    required_attrs = ['id', 'name', 'attrs']
-    return all(hasattr(container, attr) for attr in required_attrs)
-
 def is_container_running(container: Any) -> bool:
     """
     Check if a container is running with robust error handling.